@@ -17,7 +17,6 @@ import qasync
 from src.core.database import Database
 from src.core.account_manager import AccountManager
 from src.core.plugin_system import PluginSystem
-from src.core.async_manager import AsyncManager
 
 # Настройка логирования
 logging.basicConfig(
@@ -26,17 +25,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Имя плагина, таблицу которого нужно обновлять после авторизации
+ACCOUNTS_PLUGIN_NAME = "Аккаунты"
+
 
 class MainApp(QMainWindow):
     """Главное окно приложения TeleMatrix Pro"""
     
+    # Повторяющиеся сообщения статус-бара
+    _MSG_READY = "Готов"
+    _MSG_INIT_ERR = "Ошибка инициализации"
+    _MSG_CHECK_ERR = "Ошибка проверки"
+    _MSG_AUTH_ERR = "Ошибка авторизации"
+    
     def __init__(self):
         super().__init__()
         # Инициализация компонентов
         self.database = None
         self.account_manager = None
         self.plugin_system = None
-        self.async_manager = None
+        # AsyncManager создаётся при первом обращении (см. свойство async_manager)
+        self._async_manager = None
+        # Вкладки-заглушки, виджеты которых ещё не созданы: заглушка -> имя плагина
+        self._pending_plugins = {}
+        # Виджет плагина Аккаунты (появляется после первого открытия вкладки)
+        self._accounts_plugin_widget = None
         
         self.init_ui()
         self.init_core()
@@ -59,11 +72,8 @@ class MainApp(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
         
-        # Центрирование окна на экране
-        self.center_window()
-        
-        # Установка начального размера окна после центрирования
-        self.resize(1400, 800)
+        # Начальный размер и положение окна по центру экрана
+        self.center_window(1400, 800)
     
     def create_menu_bar(self):
         """Создание меню-бара приложения"""
@@ -83,9 +93,24 @@ class MainApp(QMainWindow):
         """Создание статус-бара"""
         self.statusBar = QStatusBar()
         self.setStatusBar(self.statusBar)
-        self.statusBar.showMessage("Готов")
+        self._set_status(self._MSG_READY)
         logger.info("Статус-бар создан")
     
+    @property
+    def async_manager(self):
+        """
+        Менеджер асинхронных операций, создаётся при первом обращении
+        
+        Модуль async_manager импортирует Telethon, поэтому он не загружается
+        до первой операции с Telegram и не замедляет первую отрисовку окна.
+        """
+        if self._async_manager is None:
+            logger.info("Создание AsyncManager...")
+            from src.core.async_manager import AsyncManager
+            self._async_manager = AsyncManager(self.account_manager, self.database)
+            logger.info("✅ AsyncManager создан")
+        return self._async_manager
+    
     def init_core(self):
         """Инициализация основных компонентов приложения"""
         try:
@@ -108,21 +133,16 @@ class MainApp(QMainWindow):
             self.plugin_system = PluginSystem(self.account_manager, self.database)
             logger.info("✅ PluginSystem создан")
             
-            # Создание менеджера асинхронных операций
-            logger.info("Создание AsyncManager...")
-            self.async_manager = AsyncManager(self.account_manager, self.database)
-            logger.info("✅ AsyncManager создан")
-            
             # Загрузка плагинов
             logger.info("Загрузка плагинов...")
             plugins_count = self.plugin_system.load_plugins("src/plugins")
-            logger.info(f"✅ Загружено плагинов: {plugins_count}")
+            logger.info("✅ Загружено плагинов: %s", plugins_count)
             
             # Отображение плагинов во вкладках
             self.load_plugins_to_tabs()
             
             # Обновление статус-бара
-            self.statusBar.showMessage(f"Готов | Плагинов: {plugins_count}")
+            self._set_status(f"{self._MSG_READY} | Плагинов: {plugins_count}")
             
             logger.info("✅ Все компоненты успешно инициализированы")
             
@@ -138,7 +158,7 @@ class MainApp(QMainWindow):
             )
             
             # Обновляем статус-бар
-            self.statusBar.showMessage("Ошибка инициализации")
+            self._set_status(self._MSG_INIT_ERR)
     
     def load_plugins_to_tabs(self):
         """Загружает плагины во вкладки интерфейса"""
@@ -158,33 +178,29 @@ class MainApp(QMainWindow):
                 logger.warning("Плагины не найдены, показана заглушка")
                 return
             
-            # Добавляем каждый плагин как вкладку
-            for plugin_info in plugins:
-                plugin_name = plugin_info['name']
-                
-                # Создаём виджет плагина
-                widget = self.plugin_system.get_plugin_widget(plugin_name)
-                
-                if widget is None:
-                    logger.warning(f"Не удалось создать виджет для плагина: {plugin_name}")
-                    continue
-                
-                # Получаем информацию о плагине
-                if hasattr(widget, 'get_info'):
-                    info = widget.get_info()
-                    tab_label = f"{info['icon']} {info['name']}"
-                else:
-                    # Если метод get_info отсутствует, используем данные из списка
-                    tab_label = f"{plugin_info['icon']} {plugin_info['name']}"
-                
-                # Добавляем вкладку
-                self.tabs.addTab(widget, tab_label)
-                logger.info(f"✅ Добавлена вкладка: {tab_label}")
-            
-            logger.info(f"✅ Всего вкладок создано: {self.tabs.count()}")
+            # Добавляем каждый плагин как вкладку-заглушку.
+            # Виджет плагина создаётся при первом открытии вкладки
+            # Отключаем перерисовку, чтобы вкладки отрисовались один раз
+            self.tabs.setUpdatesEnabled(False)
+            self.tabs.blockSignals(True)
+            try:
+                for plugin_info in plugins:
+                    tab_label = plugin_info['tab_label']
+                    placeholder = QWidget()
+                    self._pending_plugins[placeholder] = plugin_info['name']
+                    self.tabs.addTab(placeholder, tab_label)
+                    logger.info("✅ Добавлена вкладка: %s", tab_label)
+            finally:
+                self.tabs.blockSignals(False)
+                self.tabs.setUpdatesEnabled(True)
+            
+            self.tabs.currentChanged.connect(self._materialize_tab)
+            self._materialize_tab(self.tabs.currentIndex())
+            
+            logger.info("✅ Всего вкладок создано: %s", self.tabs.count())
             
         except Exception as e:
-            logger.error(f"Ошибка загрузки плагинов во вкладки: {e}", exc_info=True)
+            logger.error("Ошибка загрузки плагинов во вкладки: %s", e, exc_info=True)
             # Показываем заглушку при ошибке
             placeholder = QWidget()
             layout = QVBoxLayout()
@@ -194,18 +210,73 @@ class MainApp(QMainWindow):
             placeholder.setLayout(layout)
             self.tabs.addTab(placeholder, "Ошибка")
     
-    def center_window(self):
-        """Центрирует окно на экране"""
+    def _materialize_tab(self, index: int):
+        """
+        Создаёт виджет плагина для вкладки при её первом открытии
+        
+        Args:
+            index: Индекс активной вкладки
+        """
+        placeholder = self.tabs.widget(index)
+        plugin_name = self._pending_plugins.pop(placeholder, None)
+        if plugin_name is None:
+            return
+        
+        try:
+            widget = self.plugin_system.get_plugin_widget(plugin_name)
+            
+            if widget is None:
+                logger.warning("Не удалось создать виджет для плагина: %s", plugin_name)
+                return
+            
+            # Подменяем заглушку реальным виджетом на том же месте
+            tab_label = self.tabs.tabText(index)
+            self.tabs.blockSignals(True)
+            try:
+                self.tabs.removeTab(index)
+                self.tabs.insertTab(index, widget, tab_label)
+                self.tabs.setCurrentIndex(index)
+            finally:
+                self.tabs.blockSignals(False)
+            placeholder.deleteLater()
+            
+            if plugin_name == ACCOUNTS_PLUGIN_NAME:
+                self._accounts_plugin_widget = widget
+            
+            logger.info("✅ Виджет вкладки создан: %s", tab_label)
+            
+        except Exception as e:
+            logger.error("Ошибка создания виджета плагина %s: %s", plugin_name, e, exc_info=True)
+    
+    def _set_status(self, message: str):
+        """
+        Показывает сообщение в статус-баре, если оно отличается от текущего
+        
+        Args:
+            message: Текст сообщения
+        """
+        if self.statusBar.currentMessage() != message:
+            self.statusBar.showMessage(message)
+    
+    def center_window(self, width: int, height: int):
+        """
+        Задаёт размер окна и центрирует его на экране одним вызовом setGeometry
+        
+        Args:
+            width: Ширина окна
+            height: Высота окна
+        """
         # Получаем геометрию экрана
         screen = self.screen().availableGeometry()
-        # Получаем геометрию окна
-        window = self.frameGeometry()
         # Вычисляем центр экрана
         center_point = screen.center()
-        # Перемещаем центр окна в центр экрана
-        window.moveCenter(center_point)
-        # Устанавливаем позицию окна
-        self.move(window.topLeft())
+        # Устанавливаем размер и позицию окна за один проход
+        self.setGeometry(
+            center_point.x() - width // 2,
+            center_point.y() - height // 2,
+            width,
+            height
+        )
     
     @qasync.asyncSlot(str)
     async def check_account_async(self, phone: str):
@@ -216,42 +287,45 @@ class MainApp(QMainWindow):
             phone: Номер телефона аккаунта для проверки
         """
         try:
-            logger.info(f"Начало проверки аккаунта: {phone}")
+            logger.info("Начало проверки аккаунта: %s", phone)
             
             # Обновляем статус-бар
-            self.statusBar.showMessage(f"Проверка аккаунта {phone}...")
+            self._set_status(f"Проверка аккаунта {phone}...")
             
             # Выполняем проверку через AsyncManager
             account_info = await self.async_manager.check_account(phone)
             
             # Формируем сообщение с результатом
             if account_info:
-                message = f"✅ Аккаунт проверен успешно!\n\n"
-                message += f"ID: {account_info.get('id', 'N/A')}\n"
-                message += f"Username: @{account_info.get('username', 'N/A')}\n"
-                message += f"Имя: {account_info.get('first_name', 'N/A')}\n"
-                if account_info.get('last_name'):
-                    message += f"Фамилия: {account_info.get('last_name')}\n"
-                message += f"Телефон: {account_info.get('phone', 'N/A')}\n"
-                message += f"Бот: {'Да' if account_info.get('is_bot') else 'Нет'}\n"
-                message += f"Premium: {'Да' if account_info.get('is_premium') else 'Нет'}"
+                lines = [
+                    "✅ Аккаунт проверен успешно!",
+                    "",
+                    f"ID: {account_info.id}",
+                    f"Username: @{account_info.username}",
+                    f"Имя: {account_info.first_name}",
+                    f"Фамилия: {account_info.last_name}" if account_info.last_name else None,
+                    f"Телефон: {account_info.phone}",
+                    f"Бот: {'Да' if account_info.is_bot else 'Нет'}",
+                    f"Premium: {'Да' if account_info.is_premium else 'Нет'}",
+                ]
+                message = "\n".join(line for line in lines if line is not None)
                 
                 QMessageBox.information(
                     self,
                     "Проверка аккаунта",
                     message
                 )
-                logger.info(f"Проверка аккаунта {phone} завершена успешно")
+                logger.info("Проверка аккаунта %s завершена успешно", phone)
             else:
                 QMessageBox.warning(
                     self,
                     "Проверка аккаунта",
                     f"Не удалось проверить аккаунт {phone}.\nВозможно, аккаунт не авторизован или произошла ошибка."
                 )
-                logger.warning(f"Проверка аккаунта {phone} не удалась")
+                logger.warning("Проверка аккаунта %s не удалась", phone)
             
             # Обновляем статус-бар
-            self.statusBar.showMessage("Готов")
+            self._set_status(self._MSG_READY)
             
         except Exception as e:
             error_msg = f"Ошибка проверки аккаунта {phone}: {str(e)}"
@@ -264,7 +338,7 @@ class MainApp(QMainWindow):
             )
             
             # Обновляем статус-бар
-            self.statusBar.showMessage("Ошибка проверки")
+            self._set_status(self._MSG_CHECK_ERR)
     
     @qasync.asyncSlot(str)
     async def authenticate_account(self, phone: str):
@@ -275,7 +349,7 @@ class MainApp(QMainWindow):
             phone: Номер телефона аккаунта для авторизации
         """
         try:
-            logger.info(f"Начало авторизации аккаунта: {phone}")
+            logger.info("Начало авторизации аккаунта: %s", phone)
             
             # Получаем данные аккаунта
             account_data = self.account_manager.get_account_by_phone(phone)
@@ -300,10 +374,11 @@ class MainApp(QMainWindow):
                     return
             
             # Обновляем статус-бар
-            self.statusBar.showMessage(f"Авторизация аккаунта {phone}...")
+            self._set_status(f"Авторизация аккаунта {phone}...")
             
-            # Создаём клиента
-            client = self.async_manager.create_client(phone)
+            # Отдельный клиент для авторизации: общий клиент из кэша AsyncManager
+            # используют запущенные операции этого аккаунта, его не трогаем
+            client = await self.async_manager.create_client_async(phone)
             if not client:
                 QMessageBox.critical(
                     self,
@@ -337,15 +412,17 @@ class MainApp(QMainWindow):
                 return ""
             
             # Запускаем авторизацию
-            success = await self.async_manager.start_client(
-                client,
-                phone,
-                code_callback=get_code_from_dialog,
-                password_callback=get_password_from_dialog
-            )
-            
-            # Отключаем клиента
-            await self.async_manager.disconnect(client)
+            try:
+                success = await self.async_manager.start_client(
+                    client,
+                    phone,
+                    code_callback=get_code_from_dialog,
+                    password_callback=get_password_from_dialog
+                )
+            finally:
+                # Клиент авторизации не кэшируется: следующие операции
+                # получат клиента, созданного из сохранённой сессии
+                await self.async_manager.disconnect(client)
             
             if success:
                 QMessageBox.information(
@@ -353,7 +430,7 @@ class MainApp(QMainWindow):
                     "Успех",
                     f"Аккаунт {phone} успешно авторизован!\nСессия сохранена в базе данных."
                 )
-                logger.info(f"Аккаунт {phone} успешно авторизован")
+                logger.info("Аккаунт %s успешно авторизован", phone)
                 
                 # Обновляем таблицу в плагине Аккаунты, если он загружен
                 self._refresh_accounts_plugin()
@@ -363,10 +440,10 @@ class MainApp(QMainWindow):
                     "Ошибка авторизации",
                     f"Не удалось авторизовать аккаунт {phone}.\nПроверьте код подтверждения и попробуйте снова."
                 )
-                logger.warning(f"Авторизация аккаунта {phone} не удалась")
+                logger.warning("Авторизация аккаунта %s не удалась", phone)
             
             # Обновляем статус-бар
-            self.statusBar.showMessage("Готов")
+            self._set_status(self._MSG_READY)
             
         except Exception as e:
             error_msg = f"Ошибка авторизации аккаунта {phone}: {str(e)}"
@@ -379,20 +456,41 @@ class MainApp(QMainWindow):
             )
             
             # Обновляем статус-бар
-            self.statusBar.showMessage("Ошибка авторизации")
+            self._set_status(self._MSG_AUTH_ERR)
     
     def _refresh_accounts_plugin(self):
         """Обновляет таблицу аккаунтов в плагине Аккаунты"""
         try:
-            # Находим виджет плагина Аккаунты
-            for i in range(self.tabs.count()):
-                widget = self.tabs.widget(i)
-                if widget and hasattr(widget, 'load_accounts'):
-                    widget.load_accounts()
-                    logger.debug("Таблица аккаунтов обновлена")
-                    break
+            # Если вкладка ещё не открывалась, таблица загрузится при создании виджета
+            if self._accounts_plugin_widget is not None:
+                self._accounts_plugin_widget.load_accounts()
+                logger.debug("Таблица аккаунтов обновлена")
+        except Exception as e:
+            logger.error("Ошибка обновления таблицы аккаунтов: %s", e, exc_info=True)
+
+    
+    @qasync.asyncClose
+    async def closeEvent(self, event):
+        """
+        Отключает клиентов Telegram и закрывает БД перед закрытием окна
+        
+        Args:
+            event: Событие закрытия окна
+        """
+        try:
+            # AsyncManager, который так и не понадобился, не создаём
+            if self._async_manager:
+                # Сначала клиенты фонового loop плагинов, затем клиенты главного loop
+                await self._async_manager.shutdown_worker()
+                await self._async_manager.close_all()
+        except Exception as e:
+            logger.error("Ошибка отключения клиентов: %s", e, exc_info=True)
+        
+        try:
+            if self.database:
+                self.database.close()
         except Exception as e:
-            logger.error(f"Ошибка обновления таблицы аккаунтов: {e}", exc_info=True)
+            logger.error("Ошибка закрытия базы данных: %s", e, exc_info=True)
 
 
 def main():
@@ -406,9 +504,9 @@ def main():
     window = MainApp()
     window.show()
     
-    # Запускаем event loop
+    # Запускаем event loop; ресурсы освобождаются в MainApp.closeEvent
     with loop:
-        sys.exit(loop.run_forever())
+        loop.run_forever()
 
 
 if __name__ == "__main__":
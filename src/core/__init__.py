@@ -2,3 +2,27 @@
 Ядро приложения Telematrix Pro
 """
 
+import importlib
+
+# Публичные классы ядра и модули, в которых они определены.
+# Модули импортируются при первом обращении к атрибуту пакета,
+# чтобы `import src.core` не тянул за собой Telethon и PyQt6
+_LAZY_EXPORTS = {
+    'Database': '.database',
+    'AccountManager': '.account_manager',
+    'AsyncManager': '.async_manager',
+    'PluginSystem': '.plugin_system',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    """Лениво импортирует публичные классы ядра"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
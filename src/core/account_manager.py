@@ -3,15 +3,45 @@
 """
 
 import logging
-from datetime import datetime
-from typing import Optional, List, Dict, Any
-from telethon import TelegramClient
-from telethon.sessions import StringSession
+from collections import namedtuple
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Callable, Iterable, Tuple
 
-from .database import Database
+from .database import Database, now_iso
+
+if TYPE_CHECKING:
+    from telethon import TelegramClient
 
 logger = logging.getLogger(__name__)
 
+# Колонки таблицы accounts: метаданные и полная запись (с session_string)
+COLUMNS_META = "id, phone, api_id, api_hash, created_at"
+COLUMNS_FULL = COLUMNS_META + ", session_string"
+# Ключи метаданных: по ним полная запись из кэша урезается до метаданных
+META_KEYS = tuple(COLUMNS_META.split(", "))
+
+# Запросы собираются один раз при импорте модуля
+SELECT_ALL_SQL = f"SELECT {COLUMNS_FULL} FROM accounts ORDER BY created_at DESC, id DESC"
+SELECT_BY_PHONE_SQL = f"SELECT {COLUMNS_FULL} FROM accounts WHERE phone = ? LIMIT 1"
+SELECT_META_BY_PHONE_SQL = f"SELECT {COLUMNS_META} FROM accounts WHERE phone = ? LIMIT 1"
+EXISTS_BY_PHONE_SQL = "SELECT EXISTS(SELECT 1 FROM accounts WHERE phone = ? LIMIT 1)"
+DELETE_BY_PHONE_SQL = "DELETE FROM accounts WHERE phone = ?"
+INSERT_ACCOUNT_SQL = """
+    INSERT INTO accounts (phone, api_id, api_hash, session_string, created_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(phone) DO NOTHING
+    RETURNING id
+"""
+
+# Строка списка аккаунтов для таблиц (без session_string)
+AccountListRow = namedtuple("AccountListRow", "id phone api_id created_at authed")
+SELECT_LIST_SQL = """
+    SELECT id, phone, api_id, created_at, session_string IS NOT NULL AS authed
+    FROM accounts ORDER BY created_at DESC, id DESC
+"""
+
+# Маркер отсутствия записи в кэше (None в кэше означает «аккаунт не найден»)
+_CACHE_MISS = object()
+
 
 class AccountManager:
     """Менеджер для работы с Telegram аккаунтами"""
@@ -24,6 +54,10 @@ class AccountManager:
             database: Экземпляр Database для работы с БД
         """
         self.db = database
+        # Кэш аккаунтов по номеру телефона (None - аккаунт отсутствует в БД)
+        self._by_phone: Dict[str, Optional[Dict[str, Any]]] = {}
+        # Обработчики удаления аккаунта (получают номер телефона)
+        self._delete_listeners: List[Callable[[str], None]] = []
         logger.info("AccountManager инициализирован")
     
     def add_account(
@@ -49,28 +83,86 @@ class AccountManager:
             Exception: При ошибке добавления аккаунта
         """
         try:
-            # Проверяем, не существует ли уже аккаунт с таким номером
-            existing = self.get_account_by_phone(phone)
-            if existing:
-                logger.warning(f"Аккаунт с номером {phone} уже существует")
-                raise ValueError(f"Аккаунт с номером {phone} уже существует")
-            
-            # Создаём запись в БД
-            created_at = datetime.now().isoformat()
-            query = """
-                INSERT INTO accounts (phone, api_id, api_hash, session_string, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """
-            account_id = self.db.execute(
+            # Уникальность номера обеспечивает индекс idx_accounts_phone:
+            # при конфликте INSERT ничего не вставляет и не возвращает строку
+            created_at = now_iso()
+            query = INSERT_ACCOUNT_SQL
+            row = self.db.execute_returning(
                 query,
                 (phone, api_id, api_hash, session_string, created_at)
             )
+            if row is None:
+                logger.warning("Аккаунт с номером %s уже существует", phone)
+                raise ValueError(f"Аккаунт с номером {phone} уже существует")
+            
+            account_id = row['id']
+            
+            # Кэшируем созданный аккаунт
+            self._by_phone[phone] = {
+                'id': account_id,
+                'phone': phone,
+                'api_id': api_id,
+                'api_hash': api_hash,
+                'session_string': session_string,
+                'created_at': created_at
+            }
             
-            logger.info(f"Аккаунт добавлен: {phone} (ID: {account_id})")
+            logger.info("Аккаунт добавлен: %s (ID: %s)", phone, account_id)
             return account_id
             
         except Exception as e:
-            logger.error(f"Ошибка добавления аккаунта {phone}: {e}")
+            logger.error("Ошибка добавления аккаунта %s: %s", phone, e)
+            raise
+    
+    def add_accounts_bulk(
+        self,
+        records: Iterable[Tuple[str, int, str, Optional[str]]]
+    ) -> List[Tuple[int, str]]:
+        """
+        Добавляет несколько аккаунтов одной транзакцией
+        
+        Номера, которые уже есть в базе (или повторяются в records),
+        пропускаются без ошибки.
+        
+        Args:
+            records: Записи (phone, api_id, api_hash, session_string)
+        
+        Returns:
+            Пары (id, phone) добавленных аккаунтов в порядке records
+        
+        Raises:
+            Exception: При ошибке добавления аккаунтов (транзакция откатывается)
+        """
+        try:
+            created_at = now_iso()
+            rows = [
+                (phone, api_id, api_hash, session_string, created_at)
+                for phone, api_id, api_hash, session_string in records
+            ]
+            if not rows:
+                return []
+            
+            # Один COMMIT на весь пакет; RETURNING показывает, какие номера
+            # действительно добавлены, а какие пропущены как дубликаты.
+            # executemany не используется: sqlite3 не отдаёт строки RETURNING
+            # из executemany, а без них нельзя вернуть id добавленных аккаунтов
+            query = INSERT_ACCOUNT_SQL
+            inserted: List[Tuple[int, str]] = []
+            with self.db.transaction():
+                for row in rows:
+                    result = self.db.execute_returning(query, row)
+                    if result is not None:
+                        inserted.append((result['id'], row[0]))
+            
+            # Сбрасываем кэш по затронутым номерам (в том числе отрицательные записи)
+            for row in rows:
+                self._by_phone.pop(row[0], None)
+            
+            logger.info("Пакетно добавлено аккаунтов: %s из %s", len(inserted), len(rows))
+            return inserted
+            
+        except Exception as e:
+            logger.error("Ошибка пакетного добавления аккаунтов: %s", e)
             raise
     
     def get_all_accounts(self) -> List[Dict[str, Any]]:
@@ -81,25 +173,44 @@ class AccountManager:
             Список словарей с данными аккаунтов
         """
         try:
-            query = "SELECT * FROM accounts ORDER BY created_at DESC"
+            query = SELECT_ALL_SQL
             rows = self.db.fetch_all(query)
             
-            accounts = []
-            for row in rows:
-                accounts.append({
-                    'id': row['id'],
-                    'phone': row['phone'],
-                    'api_id': row['api_id'],
-                    'api_hash': row['api_hash'],
-                    'session_string': row['session_string'],
-                    'created_at': row['created_at']
-                })
-            
-            logger.info(f"Получено аккаунтов: {len(accounts)}")
+            # sqlite3.Row преобразуется в словарь с ключами по колонкам запроса
+            accounts = [dict(row) for row in rows]
+            
+            # Обновляем кэш всеми полученными аккаунтами
+            self._by_phone.update((account['phone'], account) for account in accounts)
+            
+            logger.info("Получено аккаунтов: %s", len(accounts))
             return accounts
             
         except Exception as e:
-            logger.error(f"Ошибка получения списка аккаунтов: {e}")
+            logger.error("Ошибка получения списка аккаунтов: %s", e)
+            raise
+    
+    def get_accounts_columnar(self) -> Dict[str, List[Any]]:
+        """
+        Возвращает все аккаунты по колонкам (для заполнения таблиц)
+        
+        Строки курсора транспонируются в отдельные списки, поэтому словари
+        на каждый аккаунт не создаются. session_string не загружается.
+        
+        Returns:
+            Словарь {колонка: список значений} с ключами
+            id, phone, api_id, created_at, authed
+        """
+        try:
+            rows = self.db.fetch_all_as(AccountListRow, SELECT_LIST_SQL)
+            
+            keys = AccountListRow._fields
+            columns = list(zip(*rows)) or [()] * len(keys)
+            
+            logger.info("Получено аккаунтов: %s", len(rows))
+            return {key: list(values) for key, values in zip(keys, columns)}
+            
+        except Exception as e:
+            logger.error("Ошибка получения списка аккаунтов: %s", e)
             raise
     
     def get_account_by_phone(self, phone: str) -> Optional[Dict[str, Any]]:
@@ -112,30 +223,77 @@ class AccountManager:
         Returns:
             Словарь с данными аккаунта или None, если не найден
         """
+        cached = self._by_phone.get(phone, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            logger.debug("Аккаунт взят из кэша: %s", phone)
+            return cached
+        
         try:
-            query = "SELECT * FROM accounts WHERE phone = ? LIMIT 1"
-            rows = self.db.fetch_all(query, (phone,))
-            
-            if rows:
-                row = rows[0]
-                account = {
-                    'id': row['id'],
-                    'phone': row['phone'],
-                    'api_id': row['api_id'],
-                    'api_hash': row['api_hash'],
-                    'session_string': row['session_string'],
-                    'created_at': row['created_at']
-                }
-                logger.debug(f"Аккаунт найден: {phone}")
+            query = SELECT_BY_PHONE_SQL
+            row = self.db.fetch_one(query, (phone,))
+            
+            if row is not None:
+                account = dict(row)
+                logger.debug("Аккаунт найден: %s", phone)
+                self._by_phone[phone] = account
                 return account
             
-            logger.debug(f"Аккаунт не найден: {phone}")
+            logger.debug("Аккаунт не найден: %s", phone)
+            self._by_phone[phone] = None
+            return None
+            
+        except Exception as e:
+            logger.error("Ошибка поиска аккаунта %s: %s", phone, e)
+            raise
+    
+    def get_account_meta_by_phone(self, phone: str) -> Optional[Dict[str, Any]]:
+        """
+        Поиск метаданных аккаунта по номеру телефона (без session_string)
+        
+        Args:
+            phone: Номер телефона для поиска
+        
+        Returns:
+            Словарь с метаданными аккаунта или None, если не найден
+        """
+        cached = self._by_phone.get(phone, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            # В кэше полная запись: session_string наружу не отдаём
+            if cached is None:
+                return None
+            return {key: cached[key] for key in META_KEYS}
+        
+        try:
+            query = SELECT_META_BY_PHONE_SQL
+            row = self.db.fetch_one(query, (phone,))
+            
+            if row is not None:
+                return dict(row)
+            
+            logger.debug("Аккаунт не найден: %s", phone)
             return None
             
         except Exception as e:
-            logger.error(f"Ошибка поиска аккаунта {phone}: {e}")
+            logger.error("Ошибка поиска аккаунта %s: %s", phone, e)
             raise
     
+    def _account_exists(self, phone: str) -> bool:
+        """
+        Проверяет существование аккаунта без загрузки его данных
+        
+        Args:
+            phone: Номер телефона для проверки
+        
+        Returns:
+            True если аккаунт с таким номером существует
+        """
+        cached = self._by_phone.get(phone, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            return cached is not None
+        
+        query = EXISTS_BY_PHONE_SQL
+        return bool(self.db.fetch_one(query, (phone,))[0])
+    
     def delete_account(self, phone: str) -> bool:
         """
         Удаление аккаунта по номеру телефона
@@ -151,23 +309,49 @@ class AccountManager:
         """
         try:
             # Проверяем существование аккаунта
-            account = self.get_account_by_phone(phone)
-            if not account:
-                logger.warning(f"Аккаунт для удаления не найден: {phone}")
+            if not self._account_exists(phone):
+                logger.warning("Аккаунт для удаления не найден: %s", phone)
                 return False
             
             # Удаляем аккаунт
-            query = "DELETE FROM accounts WHERE phone = ?"
+            query = DELETE_BY_PHONE_SQL
             self.db.execute(query, (phone,))
+            self._by_phone.pop(phone, None)
             
-            logger.info(f"Аккаунт удалён: {phone}")
+            logger.info("Аккаунт удалён: %s", phone)
+            for listener in self._delete_listeners:
+                listener(phone)
             return True
             
         except Exception as e:
-            logger.error(f"Ошибка удаления аккаунта {phone}: {e}")
+            logger.error("Ошибка удаления аккаунта %s: %s", phone, e)
             raise
     
-    def create_client(self, phone: str) -> Optional[TelegramClient]:
+    def add_delete_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Регистрирует обработчик, вызываемый после удаления аккаунта
+        
+        Args:
+            listener: Функция, принимающая номер телефона удалённого аккаунта
+        """
+        self._delete_listeners.append(listener)
+    
+    def invalidate_cache(self, phone: Optional[str] = None) -> None:
+        """
+        Сбрасывает кэш аккаунтов
+        
+        Вызывается после изменения записи в таблице accounts в обход AccountManager
+        (например, при сохранении session_string).
+        
+        Args:
+            phone: Номер телефона аккаунта (если не указан, кэш очищается полностью)
+        """
+        if phone is None:
+            self._by_phone.clear()
+        else:
+            self._by_phone.pop(phone, None)
+    
+    def create_client(self, phone: str) -> Optional["TelegramClient"]:
         """
         Создаёт TelegramClient из данных аккаунта
         
@@ -180,32 +364,40 @@ class AccountManager:
         Raises:
             Exception: При ошибке создания клиента
         """
+        # Telethon импортируется только здесь: остальным методам он не нужен,
+        # а его импорт заметно замедляет запуск
+        from telethon import TelegramClient
+        from telethon.sessions import StringSession
+        
+        from .async_manager import CLIENT_OPTIONS
+        
         try:
             # Получаем данные аккаунта
             account = self.get_account_by_phone(phone)
             if not account:
-                logger.error(f"Аккаунт не найден: {phone}")
+                logger.error("Аккаунт не найден: %s", phone)
                 return None
             
             # Проверяем наличие session_string
             if not account['session_string']:
-                logger.error(f"У аккаунта {phone} отсутствует session_string")
+                logger.error("У аккаунта %s отсутствует session_string", phone)
                 raise ValueError(f"У аккаунта {phone} отсутствует session_string")
             
             # Создаём сессию из строки
             session = StringSession(account['session_string'])
             
-            # Создаём клиент
+            # Создаём клиент с общими параметрами соединения
             client = TelegramClient(
                 session,
                 account['api_id'],
-                account['api_hash']
+                account['api_hash'],
+                **CLIENT_OPTIONS
             )
             
-            logger.info(f"TelegramClient создан для аккаунта: {phone}")
+            logger.info("TelegramClient создан для аккаунта: %s", phone)
             return client
             
         except Exception as e:
-            logger.error(f"Ошибка создания TelegramClient для {phone}: {e}")
+            logger.error("Ошибка создания TelegramClient для %s: %s", phone, e)
             raise
 
@@ -0,0 +1,182 @@
+"""
+Ограничение частоты запросов к Telegram (antiflood)
+"""
+
+import logging
+import asyncio
+import contextlib
+import random
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+from telethon.errors import FloodWaitError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Максимум запросов аккаунта в секунду
+MAX_REQUESTS_PER_SECOND = 10
+
+# Запас сверх времени FloodWait, которое сообщил Telegram
+FLOOD_WAIT_MARGIN = 0.5
+
+# Максимум одновременных запросов к одному дата-центру Telegram
+DC_CONCURRENCY = 4
+
+# Сетевые ошибки, после которых запрос имеет смысл повторить
+RETRYABLE_ERRORS = (ConnectionError, OSError, asyncio.TimeoutError)
+
+
+class AsyncLimiter:
+    """Token bucket: не больше max_rate запросов за time_period секунд"""
+    
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        """
+        Инициализация ограничителя
+        
+        Args:
+            max_rate: Размер корзины (количество запросов за период)
+            time_period: Период пополнения корзины в секундах
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._rate = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._updated_at = None
+    
+    async def acquire(self) -> None:
+        """Забирает токен из корзины, при необходимости ожидая его пополнения"""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if self._updated_at is not None:
+                elapsed = now - self._updated_at
+                self._tokens = min(self.max_rate, self._tokens + elapsed * self._rate)
+            self._updated_at = now
+            
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+    
+    async def __aenter__(self) -> None:
+        await self.acquire()
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+# Ограничители по клиентам: у каждого аккаунта свой TelegramClient,
+# поэтому лимит действует на аккаунт, а не на всё приложение
+_limiters: "weakref.WeakKeyDictionary[Any, AsyncLimiter]" = weakref.WeakKeyDictionary()
+
+
+def get_limiter(client: Any) -> AsyncLimiter:
+    """
+    Возвращает ограничитель частоты запросов клиента
+    
+    Args:
+        client: Экземпляр TelegramClient
+    
+    Returns:
+        AsyncLimiter клиента
+    """
+    limiter = _limiters.get(client)
+    if limiter is None:
+        limiter = _limiters[client] = AsyncLimiter(MAX_REQUESTS_PER_SECOND, 1.0)
+    return limiter
+
+
+# Семафоры по (дата-центр, event loop): семафор asyncio привязывается к event loop,
+# в котором используется. Запросы идут из event loop интерфейса и фоновых потоков,
+# поэтому словарь изменяется только под _dc_lock
+_dc_semaphores: Dict[Tuple[int, asyncio.AbstractEventLoop], asyncio.Semaphore] = {}
+_dc_lock = threading.Lock()
+
+
+def get_dc_semaphore(client: Any) -> Any:
+    """
+    Возвращает семафор дата-центра клиента для текущего event loop
+    
+    Args:
+        client: Экземпляр TelegramClient
+    
+    Returns:
+        Семафор, ограничивающий число одновременных запросов к дата-центру
+        (или пустой контекст, если дата-центр клиента неизвестен)
+    """
+    dc_id = getattr(getattr(client, 'session', None), 'dc_id', None)
+    if dc_id is None:
+        return contextlib.nullcontext()
+    
+    key = (dc_id, asyncio.get_running_loop())
+    with _dc_lock:
+        semaphore = _dc_semaphores.get(key)
+        if semaphore is None:
+            # Заодно забываем семафоры закрытых event loop
+            for stale in [stale for stale in _dc_semaphores if stale[1].is_closed()]:
+                del _dc_semaphores[stale]
+            semaphore = _dc_semaphores[key] = asyncio.Semaphore(DC_CONCURRENCY)
+    return semaphore
+
+
+async def async_antiflood(
+    fn: Callable[..., Awaitable[T]],
+    *args,
+    retries: int = 3,
+    base: float = 1.0,
+    cap: float = 30.0,
+    **kwargs
+) -> T:
+    """
+    Выполняет запрос к Telegram с ограничением частоты и повтором при ошибках
+    
+    Единая точка для всех запросов к Telegram: каждая попытка проходит через
+    ограничитель частоты клиента и семафор его дата-центра (см. DC_CONCURRENCY).
+    При FloodWait и сетевых ошибках запрос повторяется с экспоненциальной
+    задержкой (base * 2^попытка, не более cap) и случайной добавкой до 50%;
+    при FloodWait ожидание не меньше требуемого Telegram. На время паузы
+    семафор освобождается. Остальные ошибки пробрасываются сразу.
+    
+    fn - сам клиент (``async_antiflood(client, request)``) или его метод
+    (``async_antiflood(client.get_entity, username)``); лимиты берутся по клиенту.
+    
+    Args:
+        fn: Клиент или его асинхронный метод
+        *args: Позиционные аргументы вызова
+        retries: Максимальное количество повторов
+        base: Начальная задержка в секундах
+        cap: Максимальная задержка экспоненциальной части в секундах
+        **kwargs: Именованные аргументы вызова
+    
+    Returns:
+        Результат запроса
+    
+    Raises:
+        FloodWaitError: Если FloodWait повторяется после всех попыток
+        Exception: Ошибка запроса, если повторы исчерпаны или ошибка неустранима
+    """
+    client = getattr(fn, '__self__', fn)
+    limiter = get_limiter(client)
+    attempt = 0
+    while True:
+        await limiter.acquire()
+        try:
+            async with get_dc_semaphore(client):
+                return await fn(*args, **kwargs)
+        except FloodWaitError as e:
+            if attempt >= retries:
+                raise
+            backoff = min(cap, base * 2 ** attempt) * (1 + random.uniform(0, 0.5))
+            delay = max(e.seconds + FLOOD_WAIT_MARGIN, backoff)
+            logger.warning(f"FloodWait: нужно подождать {e.seconds} секунд (попытка {attempt + 1}/{retries})")
+        except RETRYABLE_ERRORS as e:
+            if attempt >= retries:
+                raise
+            delay = min(cap, base * 2 ** attempt) * (1 + random.uniform(0, 0.5))
+            logger.warning(f"Сетевая ошибка: {e} (попытка {attempt + 1}/{retries})")
+        
+        await asyncio.sleep(delay)
+        attempt += 1
@@ -4,23 +4,62 @@
 
 import logging
 import asyncio
-from typing import Optional, Dict, Any, Callable
+import inspect
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any, Awaitable, Callable, Coroutine, List, Set, Tuple, TypeVar, Union
 from telethon import TelegramClient
-from telethon.sessions import StringSession
+from telethon.sessions import MemorySession, StringSession
 from telethon.errors import (
     FloodWaitError,
     SessionPasswordNeededError,
     PhoneCodeInvalidError,
     PhoneNumberInvalidError,
     ApiIdInvalidError,
-    PhoneCodeExpiredError
+    PhoneCodeExpiredError,
+    PasswordHashInvalidError
 )
 
 from .account_manager import AccountManager
+from .antiflood import async_antiflood
 from .database import Database
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Запрос сохранения строки сессии
+UPDATE_SESSION_SQL = "UPDATE accounts SET session_string = ? WHERE phone = ?"
+
+# Параметры соединения TelegramClient: у каждого аккаунта свой auth_key и своё
+# MTProto-соединение, поэтому делить сокеты между клиентами нельзя; вместо этого
+# задаём единые настройки переподключения и повторов
+CLIENT_OPTIONS: Dict[str, Any] = {
+    'connection_retries': 5,
+    'retry_delay': 2,
+    'auto_reconnect': True,
+    'request_retries': 3,
+    'flood_sleep_threshold': 60,
+}
+
+
+@dataclass(slots=True, frozen=True)
+class AccountInfo:
+    """Данные пользователя Telegram, полученные при проверке аккаунта"""
+    
+    id: int
+    username: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    phone: Optional[str]
+    is_bot: bool
+    is_premium: bool
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает данные в виде словаря (для JSON)"""
+        return asdict(self)
+
 
 class AsyncManager:
     """Менеджер для асинхронных операций с Telegram"""
@@ -35,6 +74,27 @@ class AsyncManager:
         """
         self.account_manager = account_manager
         self.database = database
+        # Пул потоков для синхронной работы Telethon (разбор сессии, создание клиента),
+        # чтобы она не блокировала event loop интерфейса
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tele-io")
+        # Подключённые клиенты по (телефон, event loop): клиент Telethon нельзя
+        # использовать в другом event loop после подключения.
+        # Менеджер используют event loop интерфейса и фоновые потоки, поэтому
+        # _clients и _client_locks изменяются только под _cache_lock
+        self._cache_lock = threading.Lock()
+        self._clients: Dict[Tuple[str, asyncio.AbstractEventLoop], TelegramClient] = {}
+        self._client_locks: Dict[Tuple[str, asyncio.AbstractEventLoop], asyncio.Lock] = {}
+        # Выполняющиеся проверки аккаунтов по (телефон, event loop)
+        self._inflight_checks: Dict[Tuple[str, asyncio.AbstractEventLoop], "asyncio.Future"] = {}
+        # Общий фоновый event loop для долгих операций плагинов (см. run_in_worker):
+        # он работает постоянно, поэтому клиенты Telethon в нём остаются живыми между запусками
+        self._worker_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker_thread: Optional[threading.Thread] = None
+        self._worker_futures: Set[Future] = set()
+        # Отложенные сохранения сессий (телефон -> session_string) до flush_sessions()
+        self._pending_sessions: Dict[str, str] = {}
+        # Клиенты удалённого аккаунта больше не нужны
+        self.account_manager.add_delete_listener(self.evict_clients)
         logger.info("AsyncManager инициализирован")
     
     def create_client(self, phone: str) -> Optional[TelegramClient]:
@@ -58,42 +118,291 @@ class AsyncManager:
                 logger.error(f"Аккаунт не найден: {phone}")
                 return None
             
-            # Создаём сессию
-            session = None
-            if account_data.get('session_string'):
-                try:
-                    session = StringSession(account_data['session_string'])
-                    logger.debug(f"Сессия восстановлена из строки для {phone}")
-                except Exception as e:
-                    logger.warning(f"Не удалось восстановить сессию для {phone}: {e}")
-                    session = None
+            return self._build_client(phone, account_data)
             
-            # Если сессии нет, создаём новую
-            if session is None:
-                # Используем временную сессию в памяти
-                session = StringSession()
-                logger.debug(f"Создана новая сессия для {phone}")
+        except Exception as e:
+            logger.error(f"Ошибка создания TelegramClient для {phone}: {e}", exc_info=True)
+            raise
+    
+    async def create_client_async(self, phone: str) -> Optional[TelegramClient]:
+        """
+        Создаёт TelegramClient для аккаунта в пуле потоков
+        
+        Данные аккаунта читаются в текущем потоке (соединение с БД привязано к нему),
+        а разбор сессии и создание клиента выполняются в пуле, не блокируя event loop.
+        Клиент привязывается к event loop только при connect(), поэтому его можно
+        создавать в другом потоке.
+        
+        Args:
+            phone: Номер телефона аккаунта
+        
+        Returns:
+            Экземпляр TelegramClient или None, если аккаунт не найден
+        
+        Raises:
+            Exception: При ошибке создания клиента
+        """
+        try:
+            account_data = self.account_manager.get_account_by_phone(phone)
             
-            # Создаём TelegramClient
-            client = TelegramClient(
-                session,
-                account_data['api_id'],
-                account_data['api_hash']
-            )
+            if not account_data:
+                logger.error(f"Аккаунт не найден: {phone}")
+                return None
             
-            logger.info(f"TelegramClient создан для аккаунта: {phone}")
-            return client
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._build_client, phone, account_data)
             
         except Exception as e:
             logger.error(f"Ошибка создания TelegramClient для {phone}: {e}", exc_info=True)
             raise
     
+    def _build_client(self, phone: str, account_data: Dict[str, Any]) -> TelegramClient:
+        """
+        Создаёт TelegramClient по данным аккаунта
+        
+        Args:
+            phone: Номер телефона аккаунта
+            account_data: Данные аккаунта из AccountManager
+        
+        Returns:
+            Экземпляр TelegramClient
+        """
+        # Создаём сессию
+        session = None
+        if account_data.get('session_string'):
+            try:
+                session = StringSession(account_data['session_string'])
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Сессия восстановлена из строки для {phone}")
+            except Exception as e:
+                logger.warning(f"Не удалось восстановить сессию для {phone}: {e}")
+                session = None
+        
+        # Если сессии нет, создаём новую
+        if session is None:
+            # Используем временную сессию в памяти; в строку она сериализуется
+            # только после успешной авторизации
+            session = MemorySession()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Создана новая сессия для {phone}")
+        
+        # Создаём TelegramClient
+        client = TelegramClient(
+            session,
+            account_data['api_id'],
+            account_data['api_hash'],
+            **CLIENT_OPTIONS
+        )
+        
+        logger.info(f"TelegramClient создан для аккаунта: {phone}")
+        return client
+    
+    async def get_client(self, phone: str) -> Optional[TelegramClient]:
+        """
+        Возвращает подключённый TelegramClient для аккаунта
+        
+        Клиент кэшируется и переиспользуется между операциями в рамках одного
+        event loop, чтобы не повторять подключение к Telegram при каждом действии.
+        Кэшируются только авторизованные клиенты: неавторизованный клиент
+        (например, для start_client) вызывающий код отключает сам. После сохранения
+        новой сессии или удаления аккаунта клиенты номера вытесняются (evict_clients).
+        
+        Args:
+            phone: Номер телефона аккаунта
+        
+        Returns:
+            Подключённый экземпляр TelegramClient или None, если аккаунт не найден
+        
+        Raises:
+            Exception: При ошибке создания или подключения клиента
+        """
+        loop = asyncio.get_running_loop()
+        key = (phone, loop)
+        with self._cache_lock:
+            self._evict_closed_loops()
+            lock = self._client_locks.get(key)
+            if lock is None:
+                lock = self._client_locks[key] = asyncio.Lock()
+        
+        async with lock:
+            with self._cache_lock:
+                client = self._clients.get(key)
+            if client is not None and client.is_connected():
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Используется подключённый клиент для {phone}")
+                return client
+            
+            if client is None:
+                client = await self.create_client_async(phone)
+                if client is None:
+                    return None
+            
+            await client.connect()
+            if not await client.is_user_authorized():
+                # Сессии нет или она устарела: после авторизации будет создан новый клиент
+                with self._cache_lock:
+                    self._clients.pop(key, None)
+                return client
+            
+            with self._cache_lock:
+                self._clients[key] = client
+            return client
+    
+    async def close_all(self) -> None:
+        """Записывает отложенные сессии, отключает и удаляет из кэша все клиенты текущего event loop"""
+        await self.flush_sessions()
+        
+        loop = asyncio.get_running_loop()
+        with self._cache_lock:
+            keys = [key for key in self._clients if key[1] is loop]
+            clients = [self._clients.pop(key) for key in keys]
+            for key in keys:
+                self._client_locks.pop(key, None)
+        
+        # Клиенты других event loop отключаются их собственным close_all
+        for client in clients:
+            await self.disconnect(client)
+        logger.info("Все клиенты отключены")
+    
+    def run_in_worker(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """
+        Запускает корутину в общем фоновом event loop
+        
+        Loop создаётся при первом вызове и работает в отдельном потоке до
+        shutdown_worker(), поэтому клиенты, закэшированные для него в get_client,
+        продолжают обслуживать соединение (приём и ping) между запусками.
+        
+        Args:
+            coro: Корутина для выполнения
+        
+        Returns:
+            concurrent.futures.Future с результатом; cancel() отменяет корутину
+        """
+        with self._cache_lock:
+            if self._worker_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=self._run_worker_loop, args=(loop,), name="tele-worker", daemon=True
+                )
+                thread.start()
+                self._worker_loop, self._worker_thread = loop, thread
+                logger.info("Фоновый event loop запущен")
+            
+            future = asyncio.run_coroutine_threadsafe(coro, self._worker_loop)
+            self._worker_futures.add(future)
+        
+        future.add_done_callback(self._worker_futures.discard)
+        return future
+    
+    @staticmethod
+    def _run_worker_loop(loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Тело потока фонового event loop
+        
+        Args:
+            loop: Event loop, который выполняется до остановки
+        """
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+    
+    async def shutdown_worker(self, timeout: float = 10.0) -> None:
+        """
+        Останавливает фоновый event loop
+        
+        Отменяет незавершённые операции, отключает клиенты фонового loop
+        (close_all в нём самом), затем останавливает поток и закрывает loop.
+        
+        Args:
+            timeout: Максимальное время ожидания отключения клиентов в секундах
+        """
+        with self._cache_lock:
+            loop, thread = self._worker_loop, self._worker_thread
+            self._worker_loop = self._worker_thread = None
+            futures = list(self._worker_futures)
+        if loop is None:
+            return
+        
+        for future in futures:
+            future.cancel()
+        
+        try:
+            closing = asyncio.run_coroutine_threadsafe(self.close_all(), loop)
+            await asyncio.wait_for(asyncio.wrap_future(closing), timeout)
+        except Exception as e:
+            logger.error(f"Ошибка отключения клиентов фонового event loop: {e}", exc_info=True)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not loop.is_running():
+                loop.close()
+            logger.info("Фоновый event loop остановлен")
+    
+    def evict_clients(self, phone: str) -> None:
+        """
+        Удаляет из кэша и отключает клиенты аккаунта во всех event loop
+        
+        Вызывается, когда клиенты номера устарели: записана новая сессия
+        или аккаунт удалён. Следующий get_client создаст клиента заново.
+        
+        Args:
+            phone: Номер телефона аккаунта
+        """
+        with self._cache_lock:
+            keys = [key for key in self._clients if key[0] == phone]
+            evicted = [(key[1], self._clients.pop(key)) for key in keys]
+            for key in keys:
+                self._client_locks.pop(key, None)
+        
+        # Клиент отключается в своём event loop; клиенты закрытых loop просто забываются
+        for loop, client in evicted:
+            if not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(self.disconnect(client), loop)
+        if evicted:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Клиенты аккаунта {phone} удалены из кэша: {len(evicted)}")
+    
+    def _evict_closed_loops(self) -> None:
+        """Удаляет из кэша клиенты, чей event loop уже закрыт (вызывается под _cache_lock)"""
+        for key in [key for key in self._clients if key[1].is_closed()]:
+            del self._clients[key]
+            self._client_locks.pop(key, None)
+    
+    async def _prompt(
+        self,
+        callback: Optional[Callable[[str], Union[str, Awaitable[str]]]],
+        phone: str,
+        console_prompt: Optional[str] = None
+    ) -> str:
+        """
+        Запрашивает у пользователя значение, не блокируя event loop
+        
+        Args:
+            callback: Синхронная или асинхронная функция (phone) -> значение
+            phone: Номер телефона, передаваемый в callback
+            console_prompt: Подсказка для ввода из консоли, если callback не передан
+        
+        Returns:
+            Введённое значение (пустая строка, если ввод невозможен)
+        """
+        if callback is None:
+            if console_prompt is None:
+                return ""
+            # input() выполняется в пуле потоков, чтобы не останавливать другие задачи
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, input, console_prompt)
+        
+        value = callback(phone)
+        if inspect.isawaitable(value):
+            value = await value
+        return value
+    
     async def start_client(
         self,
         client: TelegramClient,
         phone: str,
-        code_callback: Optional[Callable[[str], str]] = None,
-        password_callback: Optional[Callable[[str], str]] = None
+        code_callback: Optional[Callable[[str], Union[str, Awaitable[str]]]] = None,
+        password_callback: Optional[Callable[[str], Union[str, Awaitable[str]]]] = None,
+        defer_session_save: bool = False
     ) -> bool:
         """
         Авторизует клиента в Telegram
@@ -101,7 +410,12 @@ class AsyncManager:
         Args:
             client: Экземпляр TelegramClient
             phone: Номер телефона
-            code_callback: Функция для получения кода подтверждения (phone) -> code
+            code_callback: Функция для получения кода подтверждения (phone) -> code,
+                может быть асинхронной
+            password_callback: Функция для получения пароля 2FA (phone) -> password,
+                может быть асинхронной
+            defer_session_save: Не записывать сессию сразу, а накопить её до flush_sessions()
+                (для пакетной авторизации нескольких аккаунтов)
         
         Returns:
             True если авторизация успешна, False в противном случае
@@ -118,23 +432,14 @@ class AsyncManager:
                 
                 # Отправляем запрос на код
                 try:
-                    await client.send_code_request(phone)
+                    await async_antiflood(client.send_code_request, phone)
                     logger.info(f"Запрос кода отправлен для {phone}")
                 except PhoneNumberInvalidError:
                     logger.error(f"Невалидный номер телефона: {phone}")
                     return False
-                except FloodWaitError as e:
-                    logger.error(f"FloodWait для {phone}: нужно подождать {e.seconds} секунд")
-                    await asyncio.sleep(e.seconds)
-                    # Повторяем попытку
-                    await client.send_code_request(phone)
                 
-                # Получаем код через callback
-                if code_callback:
-                    code = code_callback(phone)
-                else:
-                    # Если callback не предоставлен, запрашиваем через input (для тестирования)
-                    code = input(f"Введите код для {phone}: ")
+                # Получаем код через callback (или через консоль, если callback не передан)
+                code = await self._prompt(code_callback, phone, f"Введите код для {phone}: ")
                 
                 if not code:
                     logger.error(f"Код не предоставлен для {phone}")
@@ -142,12 +447,12 @@ class AsyncManager:
                 
                 # Пытаемся войти с кодом
                 try:
-                    await client.sign_in(phone, code)
+                    await async_antiflood(client.sign_in, phone, code)
                     logger.info(f"Успешная авторизация для {phone}")
                     
                     # Сохраняем сессию в БД
-                    session_string = client.session.save()
-                    self._save_session_string(phone, session_string)
+                    session_string = await self._serialize_session(client)
+                    await self._save_session_string(phone, session_string, defer=defer_session_save)
                     
                     return True
                     
@@ -156,17 +461,20 @@ class AsyncManager:
                     
                     # Запрашиваем пароль через callback
                     if password_callback:
-                        password = password_callback(phone)
+                        password = await self._prompt(password_callback, phone)
                         if password:
                             try:
-                                await client.sign_in(password=password)
+                                await async_antiflood(client.sign_in, password=password)
                                 logger.info(f"Успешная авторизация с паролем 2FA для {phone}")
                                 
                                 # Сохраняем сессию в БД
-                                session_string = client.session.save()
-                                self._save_session_string(phone, session_string)
+                                session_string = await self._serialize_session(client)
+                                await self._save_session_string(phone, session_string, defer=defer_session_save)
                                 
                                 return True
+                            except PasswordHashInvalidError:
+                                logger.error(f"Неверный пароль 2FA для {phone}")
+                                return False
                             except Exception as e:
                                 logger.error(f"Ошибка авторизации с паролем 2FA для {phone}: {e}", exc_info=True)
                                 return False
@@ -191,74 +499,121 @@ class AsyncManager:
                 
         except FloodWaitError as e:
             logger.error(f"FloodWait при авторизации {phone}: нужно подождать {e.seconds} секунд")
-            await asyncio.sleep(e.seconds)
             return False
             
         except Exception as e:
             logger.error(f"Ошибка авторизации для {phone}: {e}", exc_info=True)
             return False
     
-    async def check_account(self, phone: str) -> Optional[Dict[str, Any]]:
+    async def check_account(self, phone: str) -> Optional[AccountInfo]:
         """
         Проверяет аккаунт и получает информацию о пользователе
         
+        Одновременные проверки одного номера объединяются: пока проверка
+        выполняется, остальные вызовы ждут её результата.
+        
         Args:
             phone: Номер телефона аккаунта
         
         Returns:
-            Словарь с данными пользователя или None при ошибке
+            AccountInfo с данными пользователя или None при ошибке
+        """
+        key = (phone, asyncio.get_running_loop())
+        task = self._inflight_checks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._check_account(phone))
+            self._inflight_checks[key] = task
+            task.add_done_callback(lambda _: self._inflight_checks.pop(key, None))
+        
+        # shield: отмена одного из ожидающих не отменяет общую проверку
+        return await asyncio.shield(task)
+    
+    async def _check_account(self, phone: str) -> Optional[AccountInfo]:
+        """
+        Выполняет проверку аккаунта (см. check_account)
+        
+        Args:
+            phone: Номер телефона аккаунта
+        
+        Returns:
+            AccountInfo с данными пользователя или None при ошибке
         """
-        client = None
         try:
-            # Создаём клиента
-            client = self.create_client(phone)
+            # Получаем подключённого клиента (переиспользуется между проверками)
+            client = await self.get_client(phone)
             if not client:
                 return None
             
-            # Подключаемся
-            await client.connect()
-            
-            # Проверяем авторизацию
+            # Проверяем авторизацию (неавторизованный клиент не кэшируется)
             if not await client.is_user_authorized():
                 logger.warning(f"Аккаунт {phone} не авторизован")
                 await self.disconnect(client)
                 return None
             
             # Получаем информацию о себе
-            me = await client.get_me()
+            me = await async_antiflood(client.get_me)
             
             if not me:
                 logger.warning(f"Не удалось получить информацию о пользователе {phone}")
-                await self.disconnect(client)
                 return None
             
             # Формируем результат
-            account_info = {
-                'id': me.id,
-                'username': me.username,
-                'first_name': me.first_name,
-                'last_name': me.last_name,
-                'phone': me.phone,
-                'is_bot': me.bot,
-                'is_premium': getattr(me, 'premium', False)
-            }
+            account_info = AccountInfo(
+                id=me.id,
+                username=me.username,
+                first_name=me.first_name,
+                last_name=me.last_name,
+                phone=me.phone,
+                is_bot=bool(me.bot),
+                is_premium=bool(me.premium)
+            )
             
             logger.info(f"Информация о аккаунте {phone} получена: {account_info}")
             return account_info
             
         except FloodWaitError as e:
             logger.error(f"FloodWait при проверке {phone}: нужно подождать {e.seconds} секунд")
-            await asyncio.sleep(e.seconds)
             return None
             
         except Exception as e:
             logger.error(f"Ошибка проверки аккаунта {phone}: {e}", exc_info=True)
             return None
-            
-        finally:
-            # Отключаемся в любом случае
-            if client:
-                await self.disconnect(client)
+    
+    async def check_accounts(
+        self,
+        phones: List[str],
+        max_concurrency: int = 16
+    ) -> Dict[str, Optional[AccountInfo]]:
+        """
+        Проверяет несколько аккаунтов параллельно
+        
+        Args:
+            phones: Список номеров телефонов
+            max_concurrency: Максимальное число одновременных проверок
+        
+        Returns:
+            Словарь {номер телефона: AccountInfo или None при ошибке}
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def check_one(phone: str) -> Optional[AccountInfo]:
+            async with semaphore:
+                return await self.check_account(phone)
+        
+        results = await asyncio.gather(
+            *(check_one(phone) for phone in phones),
+            return_exceptions=True
+        )
+        
+        checked = {}
+        for phone, result in zip(phones, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Ошибка проверки аккаунта {phone}: {result}")
+                result = None
+            checked[phone] = result
+        
+        logger.info(f"Проверено аккаунтов: {len(checked)}")
+        return checked
     
     async def disconnect(self, client: TelegramClient) -> None:
         """
@@ -276,18 +631,65 @@ class AsyncManager:
         except Exception as e:
             logger.error(f"Ошибка отключения клиента: {e}", exc_info=True)
     
-    def _save_session_string(self, phone: str, session_string: str) -> None:
+    async def _serialize_session(self, client: TelegramClient) -> str:
+        """
+        Сериализует сессию клиента в строку в пуле потоков
+        
+        Args:
+            client: Экземпляр TelegramClient
+        
+        Returns:
+            Строка сессии StringSession
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, StringSession.save, client.session)
+    
+    async def _save_session_string(self, phone: str, session_string: str, defer: bool = False) -> None:
         """
         Сохраняет строку сессии в базу данных
         
         Args:
             phone: Номер телефона аккаунта
             session_string: Строка сессии для сохранения
+            defer: Накопить сессию и записать её при следующем flush_sessions()
         """
+        if defer:
+            self._pending_sessions[phone] = session_string
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Сохранение сессии для {phone} отложено")
+            return
+        
         try:
-            query = "UPDATE accounts SET session_string = ? WHERE phone = ?"
-            self.database.execute(query, (session_string, phone))
+            await self.database.execute_async(UPDATE_SESSION_SQL, (session_string, phone))
+            self.account_manager.invalidate_cache(phone)
+            self.evict_clients(phone)
             logger.info(f"Сессия сохранена для аккаунта {phone}")
         except Exception as e:
             logger.error(f"Ошибка сохранения сессии для {phone}: {e}", exc_info=True)
+    
+    async def flush_sessions(self) -> int:
+        """
+        Записывает все отложенные сессии одной транзакцией
+        
+        Returns:
+            Количество записанных сессий
+        """
+        if not self._pending_sessions:
+            return 0
+        
+        pending, self._pending_sessions = self._pending_sessions, {}
+        try:
+            params = [(session_string, phone) for phone, session_string in pending.items()]
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, self.database.execute_many, UPDATE_SESSION_SQL, params)
+            for phone in pending:
+                self.account_manager.invalidate_cache(phone)
+                self.evict_clients(phone)
+            logger.info(f"Сохранено сессий: {len(pending)}")
+            return len(pending)
+        except Exception as e:
+            # Возвращаем несохранённые сессии (более новые значения не затираем)
+            self._pending_sessions = {**pending, **self._pending_sessions}
+            logger.error(f"Ошибка пакетного сохранения сессий: {e}", exc_info=True)
+            return 0
 
@@ -2,17 +2,55 @@
 Менеджер SQLite базы данных для TeleMatrix Pro
 """
 
+import asyncio
 import sqlite3
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Tuple, Any
+from typing import Optional, List, Tuple, Any, Callable, Iterable, Iterator, TypeVar
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Кэш отметки времени: (секунда Unix, строка ISO)
+_now_cache: Tuple[int, str] = (0, "")
+
+
+def now_iso() -> str:
+    """
+    Возвращает текущее локальное время в формате ISO с точностью до секунды
+    
+    Строка формируется один раз в секунду, при массовых вставках
+    повторно используется уже отформатированное значение.
+    
+    Returns:
+        Строка вида YYYY-MM-DDTHH:MM:SS
+    """
+    global _now_cache
+    second = int(time.time())
+    if _now_cache[0] != second:
+        _now_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _now_cache[1]
+
 
 class Database:
     """Менеджер базы данных SQLite"""
     
+    # Настройки соединения: WAL-журнал (читатели не блокируют писателя),
+    # облегчённый fsync, временные данные и кэш страниц в памяти
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-64000",
+        "PRAGMA mmap_size=268435456",
+    )
+    
     def __init__(self, db_path: str = "telematrix.db"):
         """
         Инициализация менеджера базы данных
@@ -28,18 +66,45 @@ class Database:
         
         self.db_path = str(db_path)
         self.connection: Optional[sqlite3.Connection] = None
+        # Соединение используется из потоков инвайтинга/парсинга и из UI,
+        # поэтому обращения к нему сериализуются
+        self._lock = threading.RLock()
+        # Пул потоков для асинхронных запросов: у каждого потока
+        # собственное соединение для чтения (в WAL читатели не блокируют друг друга)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+        self._reader_connections: List[sqlite3.Connection] = []
         logger.info(f"Инициализация базы данных: {self.db_path}")
     
     def connect(self) -> None:
         """Создаёт подключение к базе данных"""
         try:
-            self.connection = sqlite3.connect(self.db_path)
-            self.connection.row_factory = sqlite3.Row  # Для доступа к колонкам по имени
+            self.connection = self._open_connection()
             logger.info("Подключение к базе данных установлено")
         except sqlite3.Error as e:
             logger.error(f"Ошибка подключения к базе данных: {e}")
             raise
     
+    def _open_connection(self) -> sqlite3.Connection:
+        """
+        Открывает соединение с настройками приложения
+        
+        Returns:
+            Новое соединение sqlite3
+        """
+        # isolation_level=None: одиночные запросы фиксируются сразу,
+        # многострочные операции явно открывают транзакцию через BEGIN
+        connection = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=512  # Кэш подготовленных запросов (по умолчанию 128)
+        )
+        connection.row_factory = sqlite3.Row  # Для доступа к колонкам по имени
+        for pragma in self.PRAGMAS:
+            connection.execute(pragma)
+        return connection
+    
     def create_tables(self) -> None:
         """Создаёт все необходимые таблицы в базе данных"""
         if not self.connection:
@@ -106,20 +171,66 @@ class Database:
                 action TEXT NOT NULL,
                 timestamp TEXT NOT NULL,
                 FOREIGN KEY (account_id) REFERENCES accounts(id)
-            )"""
+            )""",
+            
+            # Индексы
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_accounts_phone ON accounts(phone)",
+            # Уникальный индекс нужен для UPSERT парсера и заменяет прежний неуникальный
+            "DROP INDEX IF EXISTS idx_parsed_users_uid",
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_parsed_users_uid_chat ON parsed_users(user_id, chat_id)",
+            "CREATE INDEX IF NOT EXISTS idx_invites_account ON invites(account_id, status)",
+            "CREATE INDEX IF NOT EXISTS idx_invites_account_time ON invites(account_id, invited_at)",
+            "CREATE INDEX IF NOT EXISTS idx_messages_account ON messages(account_id, sent_at)",
+            "CREATE INDEX IF NOT EXISTS idx_activity_account_ts ON activity_log(account_id, timestamp)"
         ]
         
-        try:
-            cursor = self.connection.cursor()
-            for table_sql in tables:
-                cursor.execute(table_sql)
-            self.connection.commit()
-            logger.info("Таблицы базы данных созданы успешно")
-        except sqlite3.Error as e:
-            logger.error(f"Ошибка создания таблиц: {e}")
-            if self.connection:
-                self.connection.rollback()
-            raise
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+                cursor.execute("BEGIN")
+                for table_sql in tables:
+                    cursor.execute(table_sql)
+                cursor.execute("COMMIT")
+                logger.info("Таблицы базы данных созданы успешно")
+            except sqlite3.Error as e:
+                logger.error(f"Ошибка создания таблиц: {e}")
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+                raise
+    
+    @contextmanager
+    def transaction(self) -> Iterator["Database"]:
+        """
+        Выполняет группу запросов одной транзакцией
+        
+        Соединение блокируется для других потоков до конца блока.
+        Вложенный вызов присоединяется к внешней транзакции.
+        
+        Пример:
+            with db.transaction():
+                db.execute(...)
+                db.execute_many(...)
+        
+        Raises:
+            Exception: Любая ошибка внутри блока (транзакция откатывается)
+        """
+        if not self.connection:
+            self.connect()
+        
+        with self._lock:
+            if self.connection.in_transaction:
+                yield self
+                return
+            
+            self.connection.execute("BEGIN")
+            try:
+                yield self
+            except BaseException:
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+                logger.debug("Транзакция отменена")
+                raise
+            self.connection.execute("COMMIT")
     
     def execute(self, query: str, params: Tuple[Any, ...] = ()) -> Optional[int]:
         """
@@ -135,17 +246,76 @@ class Database:
         if not self.connection:
             self.connect()
         
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params)
-            self.connection.commit()
-            logger.debug(f"Запрос выполнен: {query[:50]}...")
-            return cursor.lastrowid
-        except sqlite3.Error as e:
-            logger.error(f"Ошибка выполнения запроса: {e}")
-            if self.connection:
-                self.connection.rollback()
-            raise
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+                cursor.execute(query, params)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Запрос выполнен: {query[:50]}...")
+                return cursor.lastrowid
+            except sqlite3.Error as e:
+                logger.error(f"Ошибка выполнения запроса: {e}")
+                raise
+    
+    def execute_many(self, query: str, params_seq: Iterable[Tuple[Any, ...]]) -> int:
+        """
+        Выполнение SQL запроса для набора параметров одной транзакцией
+        
+        Args:
+            query: SQL запрос с параметрами (?, ?)
+            params_seq: Последовательность кортежей параметров
+        
+        Returns:
+            Количество изменённых строк
+        """
+        if not self.connection:
+            self.connect()
+        
+        with self._lock:
+            # Без явной транзакции каждая строка фиксировалась бы отдельно
+            own_transaction = not self.connection.in_transaction
+            try:
+                cursor = self.connection.cursor()
+                if own_transaction:
+                    cursor.execute("BEGIN")
+                cursor.executemany(query, params_seq)
+                if own_transaction:
+                    cursor.execute("COMMIT")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Пакетный запрос выполнен: {query[:50]}... (строк: {cursor.rowcount})")
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                logger.error(f"Ошибка выполнения пакетного запроса: {e}")
+                if own_transaction and self.connection.in_transaction:
+                    self.connection.rollback()
+                raise
+    
+    def execute_returning(self, query: str, params: Tuple[Any, ...] = ()) -> Optional[sqlite3.Row]:
+        """
+        Выполнение SQL запроса с RETURNING
+        
+        Args:
+            query: SQL запрос с параметрами (?, ?) и секцией RETURNING
+            params: Кортеж параметров для запроса
+        
+        Returns:
+            Первая строка, возвращённая запросом, или None
+        """
+        if not self.connection:
+            self.connect()
+        
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+                cursor.execute(query, params)
+                # Запрос фиксируется после выборки всех строк RETURNING
+                rows = cursor.fetchall()
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Запрос выполнен: {query[:50]}...")
+                return rows[0] if rows else None
+            except sqlite3.Error as e:
+                logger.error(f"Ошибка выполнения запроса: {e}")
+                raise
     
     def fetch_all(self, query: str, params: Tuple[Any, ...] = ()) -> List[sqlite3.Row]:
         """
@@ -161,27 +331,224 @@ class Database:
         if not self.connection:
             self.connect()
         
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Получено строк: {len(rows)}")
+                return rows
+            except sqlite3.Error as e:
+                logger.error(f"Ошибка получения данных: {e}")
+                raise
+    
+    def fetch_all_as(
+        self,
+        row_type: Callable[..., T],
+        query: str,
+        params: Tuple[Any, ...] = ()
+    ) -> List[T]:
+        """
+        Получение всех данных по запросу в виде объектов row_type
+        
+        Строки выбираются кортежами (без sqlite3.Row) и передаются в row_type
+        позиционно, поэтому порядок колонок запроса должен совпадать с полями
+        row_type (например, namedtuple).
+        
+        Args:
+            row_type: Тип строки, вызывается как row_type(*row)
+            query: SQL запрос с параметрами (?, ?)
+            params: Кортеж параметров для запроса
+        
+        Returns:
+            Список объектов row_type
+        """
+        if not self.connection:
+            self.connect()
+        
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+                cursor.row_factory = None
+                cursor.execute(query, params)
+                rows = [row_type(*row) for row in cursor.fetchall()]
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Получено строк: {len(rows)}")
+                return rows
+            except sqlite3.Error as e:
+                logger.error(f"Ошибка получения данных: {e}")
+                raise
+    
+    def iter_rows(
+        self,
+        query: str,
+        params: Tuple[Any, ...] = (),
+        batch: int = 1000
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Построчная выборка порциями через fetchmany
+        
+        В памяти одновременно находится не больше batch строк. Выборка идёт
+        через отдельное соединение текущего потока, поэтому основное
+        соединение не блокируется на время обхода.
+        
+        Args:
+            query: SQL запрос с параметрами (?, ?)
+            params: Кортеж параметров для запроса
+            batch: Размер порции строк
+        
+        Yields:
+            Строки результата
+        """
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            logger.debug(f"Получено строк: {len(rows)}")
-            return rows
+            cursor = self._reader().execute(query, params)
         except sqlite3.Error as e:
             logger.error(f"Ошибка получения данных: {e}")
             raise
+        
+        try:
+            while True:
+                rows = cursor.fetchmany(batch)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
     
-    def close(self) -> None:
-        """Закрытие соединения с базой данных"""
-        if self.connection:
+    def fetch_one(self, query: str, params: Tuple[Any, ...] = ()) -> Optional[sqlite3.Row]:
+        """
+        Получение одной строки по запросу
+        
+        Args:
+            query: SQL запрос с параметрами (?, ?)
+            params: Кортеж параметров для запроса
+        
+        Returns:
+            Первая строка результата или None, если строк нет
+        """
+        if not self.connection:
+            self.connect()
+        
+        with self._lock:
             try:
-                self.connection.close()
-                self.connection = None
-                logger.info("Соединение с базой данных закрыто")
+                cursor = self.connection.cursor()
+                cursor.execute(query, params)
+                return cursor.fetchone()
             except sqlite3.Error as e:
-                logger.error(f"Ошибка закрытия соединения: {e}")
+                logger.error(f"Ошибка получения данных: {e}")
                 raise
     
+    def _reader(self) -> sqlite3.Connection:
+        """
+        Возвращает соединение для чтения, принадлежащее текущему потоку пула
+        
+        Returns:
+            Соединение sqlite3 текущего потока
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._open_connection()
+            self._local.connection = connection
+            with self._lock:
+                self._reader_connections.append(connection)
+        return connection
+    
+    def _fetch_all_pooled(self, query: str, params: Tuple[Any, ...]) -> List[sqlite3.Row]:
+        """Выполняет выборку на соединении текущего потока пула"""
+        try:
+            rows = self._reader().execute(query, params).fetchall()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Получено строк: {len(rows)}")
+            return rows
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка получения данных: {e}")
+            raise
+    
+    def _fetch_one_pooled(self, query: str, params: Tuple[Any, ...]) -> Optional[sqlite3.Row]:
+        """Выполняет выборку одной строки на соединении текущего потока пула"""
+        try:
+            return self._reader().execute(query, params).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка получения данных: {e}")
+            raise
+    
+    def _run_in_pool(self, func: Callable[..., Any], *args: Any) -> "asyncio.Future":
+        """
+        Запускает синхронную функцию в пуле потоков базы данных
+        
+        Args:
+            func: Функция для выполнения
+            *args: Аргументы функции
+        
+        Returns:
+            Future с результатом функции
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="db")
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
+    async def execute_async(self, query: str, params: Tuple[Any, ...] = ()) -> Optional[int]:
+        """
+        Асинхронное выполнение SQL запроса (не блокирует event loop)
+        
+        Запись идёт через основное соединение, как и в execute().
+        
+        Args:
+            query: SQL запрос с параметрами (?, ?)
+            params: Кортеж параметров для запроса
+        
+        Returns:
+            ID последней вставленной строки (для INSERT) или None
+        """
+        return await self._run_in_pool(self.execute, query, params)
+    
+    async def fetch_all_async(self, query: str, params: Tuple[Any, ...] = ()) -> List[sqlite3.Row]:
+        """
+        Асинхронное получение всех данных по запросу
+        
+        Args:
+            query: SQL запрос с параметрами (?, ?)
+            params: Кортеж параметров для запроса
+        
+        Returns:
+            Список строк результата
+        """
+        return await self._run_in_pool(self._fetch_all_pooled, query, params)
+    
+    async def fetch_one_async(self, query: str, params: Tuple[Any, ...] = ()) -> Optional[sqlite3.Row]:
+        """
+        Асинхронное получение одной строки по запросу
+        
+        Args:
+            query: SQL запрос с параметрами (?, ?)
+            params: Кортеж параметров для запроса
+        
+        Returns:
+            Первая строка результата или None, если строк нет
+        """
+        return await self._run_in_pool(self._fetch_one_pooled, query, params)
+    
+    def close(self) -> None:
+        """Закрытие соединения с базой данных"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        
+        with self._lock:
+            for connection in self._reader_connections:
+                connection.close()
+            self._reader_connections.clear()
+            
+            if self.connection:
+                try:
+                    self.connection.close()
+                    self.connection = None
+                    logger.info("Соединение с базой данных закрыто")
+                except sqlite3.Error as e:
+                    logger.error(f"Ошибка закрытия соединения: {e}")
+                    raise
+    
     def __enter__(self):
         """Поддержка контекстного менеджера (with statement)"""
         self.connect()
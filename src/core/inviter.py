@@ -4,9 +4,10 @@
 
 import logging
 import asyncio
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Union
+import re
+from typing import List, Dict, Any, Optional, Tuple, Union
 from telethon import TelegramClient
+from telethon.utils import get_input_peer
 from telethon.tl.functions.messages import AddChatUserRequest
 from telethon.tl.functions.channels import InviteToChannelRequest
 from telethon.tl.types import InputUser, InputPeerUser, InputPeerChannel, InputPeerChat
@@ -21,11 +22,26 @@ from telethon.errors import (
     UsernameNotOccupiedError
 )
 
+from .antiflood import async_antiflood
 from .async_manager import AsyncManager
-from .database import Database
+from .database import Database, now_iso
 
 logger = logging.getLogger(__name__)
 
+INSERT_INVITE_SQL = """
+    INSERT INTO invites (account_id, user_id, chat_id, status, invited_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Сколько результатов инвайта накапливать перед записью в БД одной транзакцией
+INVITES_FLUSH_SIZE = 50
+
+# Ссылка на чат: https://t.me/name, t.me/name, @name или name -> name
+_LINK_RE = re.compile(r'^(?:https?://)?(?:t\.me/)?@?(.+?)/?$')
+
+# Сколько пользователей обрабатывается одновременно
+INVITE_CONCURRENCY = 4
+
 
 class Inviter:
     """Класс для инвайтинга пользователей в чаты"""
@@ -45,6 +61,8 @@ class Inviter:
             'error': 0,
             'skipped': 0
         }
+        # Результаты инвайтов, ещё не записанные в БД
+        self._pending_invites: List[Tuple[Any, ...]] = []
         logger.info("Inviter инициализирован")
     
     async def invite_users(
@@ -73,24 +91,23 @@ class Inviter:
             'skipped': 0
         }
         
-        client = None
         try:
             # Получаем account_id по phone
-            account_data = self.async_manager.account_manager.get_account_by_phone(phone)
+            account_data = self.async_manager.account_manager.get_account_meta_by_phone(phone)
             if not account_data:
                 logger.error(f"Аккаунт не найден: {phone}")
                 return self.stats
             
             account_id = account_data['id']
             
-            # Создаём клиента
-            client = self.async_manager.create_client(phone)
+            # Берём подключённый клиент из кэша AsyncManager (соединение
+            # переиспользуется между запусками и не закрывается по окончании)
+            client = await self.async_manager.get_client(phone)
             if not client:
                 logger.error(f"Не удалось создать клиента для {phone}")
                 return self.stats
             
-            # Подключаемся и авторизуемся
-            await client.connect()
+            # Проверяем авторизацию (неавторизованный клиент не кэшируется)
             if not await client.is_user_authorized():
                 logger.error(f"Клиент не авторизован для {phone}")
                 await self.async_manager.disconnect(client)
@@ -100,7 +117,6 @@ class Inviter:
             chat_entity = await self._get_chat_entity(client, chat_link)
             if not chat_entity:
                 logger.error(f"Не удалось получить информацию о чате: {chat_link}")
-                await self.async_manager.disconnect(client)
                 return self.stats
             
             chat_id = chat_entity.id
@@ -109,77 +125,87 @@ class Inviter:
             logger.info(f"Начинаем инвайт пользователей в чат {chat_link} (ID: {chat_id})")
             logger.info(f"Всего пользователей для инвайта: {len(user_list)}")
             
-            # Инвайтим каждого пользователя
+            # Строки из цифр - это user_id (иначе Telethon примет их за номер телефона)
+            user_list = [
+                int(item) if isinstance(item, str) and item.strip().isdigit() else item
+                for item in user_list
+            ]
+            
+            # user_id разрешаем заранее одним пакетом; username - в слоте инвайта
+            # (см. worker), чтобы запросы ResolveUsername шли с интервалом delay
+            input_users = await self._resolve_user_ids(
+                client, [item for item in user_list if isinstance(item, int)]
+            )
+            
+            # Инвайтим пользователей несколькими воркерами: получение user_id и запись
+            # в БД идут параллельно, а сами инвайты по-прежнему разнесены на delay секунд
             total_users = len(user_list)
-            for index, user_identifier in enumerate(user_list, 1):
-                try:
-                    # Получаем user_id из username или используем переданный ID
-                    user_id = await self._get_user_id(client, user_identifier)
-                    if not user_id:
-                        logger.warning(f"Не удалось получить user_id для: {user_identifier}")
-                        self.stats['skipped'] += 1
-                        continue
-                    
-                    # Пытаемся добавить пользователя
-                    result = await self._invite_user(
-                        client=client,
-                        chat_entity=chat_entity,
-                        user_id=user_id,
-                        is_channel=is_channel
-                    )
-                    
-                    # Сохраняем результат в БД
-                    invited_at = datetime.now().isoformat()
-                    
-                    if result['success']:
-                        self.stats['success'] += 1
-                        status = 'success'
-                        logger.info(f"Пользователь @{user_identifier if isinstance(user_identifier, str) else user_id} - успешно добавлен")
-                    elif result['skipped']:
-                        self.stats['skipped'] += 1
-                        status = f"skipped: {result['reason']}"
-                        logger.info(f"Пользователь @{user_identifier if isinstance(user_identifier, str) else user_id} - пропущен: {result['reason']}")
-                    else:
+            semaphore = asyncio.Semaphore(INVITE_CONCURRENCY)
+            loop = asyncio.get_running_loop()
+            next_invite_at = loop.time()
+            processed = 0
+            
+            async def worker(user_identifier: Union[str, int]) -> None:
+                nonlocal next_invite_at, processed
+                async with semaphore:
+                    user_id = user_identifier if isinstance(user_identifier, int) else None
+                    try:
+                        # Занимаем ближайший слот: между инвайтами не меньше delay секунд
+                        invite_at = max(loop.time(), next_invite_at)
+                        next_invite_at = invite_at + delay
+                        await asyncio.sleep(invite_at - loop.time())
+                        
+                        # Username разрешается в своём слоте, а не общим залпом до начала
+                        if user_id is None:
+                            user_entity = await self._resolve_username(client, user_identifier)
+                            if user_entity is None:
+                                logger.warning(f"Не удалось получить user_id для: {user_identifier}")
+                                self.stats['skipped'] += 1
+                                return
+                            user_id = user_entity.id
+                            input_users[user_id] = get_input_peer(user_entity)
+                        
+                        # Пытаемся добавить пользователя
+                        result = await self._invite_user(
+                            client=client,
+                            chat_entity=chat_entity,
+                            user_id=user_id,
+                            is_channel=is_channel,
+                            input_user=input_users.get(user_id)
+                        )
+                        
+                        if result['success']:
+                            self.stats['success'] += 1
+                            status = 'success'
+                            logger.info(f"Пользователь @{user_identifier if isinstance(user_identifier, str) else user_id} - успешно добавлен")
+                        elif result['skipped']:
+                            self.stats['skipped'] += 1
+                            status = f"skipped: {result['reason']}"
+                            logger.info(f"Пользователь @{user_identifier if isinstance(user_identifier, str) else user_id} - пропущен: {result['reason']}")
+                        else:
+                            self.stats['error'] += 1
+                            status = f"error: {result['error']}"
+                            logger.error(f"Ошибка инвайта пользователя @{user_identifier if isinstance(user_identifier, str) else user_id}: {result['error']}")
+                        
+                        # Сохраняем результат в БД (пакетами)
+                        await self._record_invite(account_id, user_id, chat_id, status)
+                        
+                    except Exception as e:
+                        logger.error(f"Неожиданная ошибка при инвайте пользователя {user_identifier}: {e}", exc_info=True)
                         self.stats['error'] += 1
-                        status = f"error: {result['error']}"
-                        logger.error(f"Ошибка инвайта пользователя @{user_identifier if isinstance(user_identifier, str) else user_id}: {result['error']}")
-                    
-                    # Сохраняем в БД
-                    query = """
-                        INSERT INTO invites (account_id, user_id, chat_id, status, invited_at)
-                        VALUES (?, ?, ?, ?, ?)
-                    """
-                    self.database.execute(
-                        query,
-                        (account_id, user_id, chat_id, status, invited_at)
-                    )
-                    
-                    # Логируем прогресс
-                    logger.info(f"Прогресс: Инвайтено {index}/{total_users} (Успешно: {self.stats['success']}, Ошибок: {self.stats['error']}, Пропущено: {self.stats['skipped']})")
-                    
-                    # Задержка между инвайтами (кроме последнего)
-                    if index < total_users:
-                        await asyncio.sleep(delay)
                         
-                except Exception as e:
-                    logger.error(f"Неожиданная ошибка при инвайте пользователя {user_identifier}: {e}", exc_info=True)
-                    self.stats['error'] += 1
+                        # Сохраняем ошибку в БД
+                        try:
+                            await self._record_invite(account_id, user_id, chat_id, f"error: {str(e)}")
+                        except Exception as db_error:
+                            logger.error(f"Ошибка сохранения в БД: {db_error}")
                     
-                    # Сохраняем ошибку в БД
-                    try:
-                        user_id = await self._get_user_id(client, user_identifier) if isinstance(user_identifier, str) else user_identifier
-                        invited_at = datetime.now().isoformat()
-                        status = f"error: {str(e)}"
-                        query = """
-                            INSERT INTO invites (account_id, user_id, chat_id, status, invited_at)
-                            VALUES (?, ?, ?, ?, ?)
-                        """
-                        self.database.execute(
-                            query,
-                            (account_id, user_id, chat_id, status, invited_at)
-                        )
-                    except Exception as db_error:
-                        logger.error(f"Ошибка сохранения в БД: {db_error}")
+                    finally:
+                        # Логируем прогресс
+                        processed += 1
+                        logger.info(f"Прогресс: Инвайтено {processed}/{total_users} (Успешно: {self.stats['success']}, Ошибок: {self.stats['error']}, Пропущено: {self.stats['skipped']})")
+            
+            await asyncio.gather(*(worker(user) for user in user_list), return_exceptions=True)
             
             logger.info(f"Инвайт завершён. Статистика: {self.stats}")
             return self.stats
@@ -189,9 +215,33 @@ class Inviter:
             return self.stats
             
         finally:
-            # Отключаемся от клиента
-            if client:
-                await self.async_manager.disconnect(client)
+            # Записываем оставшиеся результаты
+            await self._flush_invites()
+    
+    async def _record_invite(self, account_id: int, user_id: Any, chat_id: int, status: str) -> None:
+        """
+        Добавляет результат инвайта в буфер и записывает буфер, когда он заполнен
+        
+        Args:
+            account_id: ID аккаунта, выполнявшего инвайт
+            user_id: ID приглашаемого пользователя
+            chat_id: ID чата
+            status: Статус инвайта
+        """
+        self._pending_invites.append((account_id, user_id, chat_id, status, now_iso()))
+        if len(self._pending_invites) >= INVITES_FLUSH_SIZE:
+            await self._flush_invites()
+    
+    async def _flush_invites(self) -> None:
+        """Записывает накопленные результаты инвайтов одной транзакцией в отдельном потоке"""
+        if not self._pending_invites:
+            return
+        
+        pending, self._pending_invites = self._pending_invites, []
+        try:
+            await asyncio.to_thread(self.database.execute_many, INSERT_INVITE_SQL, pending)
+        except Exception as e:
+            logger.error(f"Ошибка сохранения результатов инвайта в БД ({len(pending)} записей): {e}")
     
     async def _get_chat_entity(self, client: TelegramClient, chat_link: str):
         """
@@ -205,11 +255,12 @@ class Inviter:
             Chat или Channel объект или None при ошибке
         """
         try:
-            # Убираем @ если есть и извлекаем username
-            username = chat_link.replace('@', '').replace('https://t.me/', '').replace('http://t.me/', '').strip()
+            # Убираем https://t.me/ и @ одним разбором
+            match = _LINK_RE.match(chat_link.strip())
+            username = match.group(1) if match else chat_link
             
             # Получаем сущность чата
-            entity = await client.get_entity(username)
+            entity = await async_antiflood(client.get_entity, username)
             return entity
             
         except (UsernameInvalidError, UsernameNotOccupiedError) as e:
@@ -222,38 +273,50 @@ class Inviter:
             logger.error(f"Ошибка получения информации о чате {chat_link}: {e}", exc_info=True)
             return None
     
-    async def _get_user_id(self, client: TelegramClient, user_identifier: Union[str, int]) -> Optional[int]:
+    async def _resolve_user_ids(self, client: TelegramClient, user_ids: List[int]) -> Dict[int, Any]:
         """
-        Получает user_id из username или возвращает переданный ID
+        Разрешает список user_id одним вызовом get_entity
+        
+        Если пакет не разрешается, InputPeer каждого пользователя получает
+        _invite_user в слоте его инвайта.
         
         Args:
             client: TelegramClient
-            user_identifier: Username (str) или user_id (int)
+            user_ids: Список ID пользователей
         
         Returns:
-            user_id или None при ошибке
+            Словарь user_id -> InputPeer пользователя
         """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return {}
+        
         try:
-            # Если это уже число, возвращаем его
-            if isinstance(user_identifier, int):
-                return user_identifier
-            
-            # Если это строка, пытаемся получить user_id
-            if isinstance(user_identifier, str):
-                # Убираем @ если есть
-                username = user_identifier.replace('@', '').strip()
-                
-                # Получаем информацию о пользователе
-                entity = await client.get_entity(username)
-                return entity.id
-            
-            return None
-            
-        except (UsernameInvalidError, UsernameNotOccupiedError) as e:
-            logger.warning(f"Неверный username пользователя: {user_identifier} - {e}")
-            return None
+            entities = await async_antiflood(client.get_entity, user_ids)
         except Exception as e:
-            logger.error(f"Ошибка получения user_id для {user_identifier}: {e}", exc_info=True)
+            logger.warning(f"Не удалось разрешить user_id пакетом: {e}")
+            return {}
+        
+        # InputPeer строится из entity локально, без запроса к Telegram
+        return {entity.id: get_input_peer(entity) for entity in entities}
+    
+    async def _resolve_username(self, client: TelegramClient, username: str) -> Optional[Any]:
+        """
+        Разрешает username (или ссылку t.me) в entity пользователя
+        
+        Args:
+            client: TelegramClient
+            username: Username или ссылка на пользователя
+        
+        Returns:
+            Entity пользователя или None при ошибке
+        """
+        match = _LINK_RE.match(username.strip())
+        lookup = match.group(1) if match else username
+        try:
+            return await async_antiflood(client.get_entity, lookup)
+        except Exception as e:
+            logger.warning(f"Не удалось получить пользователя {lookup}: {e}")
             return None
     
     async def _invite_user(
@@ -261,7 +324,8 @@ class Inviter:
         client: TelegramClient,
         chat_entity: Any,
         user_id: int,
-        is_channel: bool
+        is_channel: bool,
+        input_user: Optional[Any] = None
     ) -> Dict[str, Any]:
         """
         Добавляет пользователя в чат
@@ -271,14 +335,16 @@ class Inviter:
             chat_entity: Сущность чата (Chat или Channel)
             user_id: ID пользователя для добавления
             is_channel: True если это канал, False если группа
+            input_user: Заранее полученный InputPeer пользователя (если есть)
         
         Returns:
             Словарь с результатом: {success: bool, skipped: bool, reason: str, error: str}
         """
-        # Получаем InputPeer для пользователя (выносим за try для использования в FloodWaitError)
+        # Получаем InputPeer для пользователя, если он не разрешён заранее
         try:
-            user_entity = await client.get_entity(user_id)
-            input_user = await client.get_input_entity(user_entity)
+            if input_user is None:
+                user_entity = await async_antiflood(client.get_entity, user_id)
+                input_user = await client.get_input_entity(user_entity)
         except Exception as e:
             error_msg = f'Ошибка получения информации о пользователе {user_id}: {str(e)}'
             logger.error(error_msg)
@@ -293,17 +359,20 @@ class Inviter:
             # Выбираем метод в зависимости от типа чата
             if is_channel:
                 # Для каналов используем InviteToChannelRequest
-                await client(InviteToChannelRequest(
+                request = InviteToChannelRequest(
                     channel=chat_entity,
                     users=[input_user]
-                ))
+                )
             else:
                 # Для групп используем AddChatUserRequest
-                await client(AddChatUserRequest(
+                request = AddChatUserRequest(
                     chat_id=chat_entity.id,
                     user_id=input_user,
                     fwd_limit=10
-                ))
+                )
+            
+            # Лимит частоты и повторы при FloodWait - в async_antiflood
+            await async_antiflood(client, request)
             
             return {'success': True, 'skipped': False, 'reason': '', 'error': ''}
             
@@ -337,35 +406,15 @@ class Inviter:
             }
         
         except FloodWaitError as e:
-            # FloodWait - пауза и повтор
-            wait_time = e.seconds
-            logger.warning(f"FloodWaitError: нужно подождать {wait_time} секунд")
-            await asyncio.sleep(wait_time)
-            
-            # Повторяем попытку
-            try:
-                if is_channel:
-                    await client(InviteToChannelRequest(
-                        channel=chat_entity,
-                        users=[input_user]
-                    ))
-                else:
-                    await client(AddChatUserRequest(
-                        chat_id=chat_entity.id,
-                        user_id=input_user,
-                        fwd_limit=10
-                    ))
-                
-                return {'success': True, 'skipped': False, 'reason': '', 'error': ''}
-            except Exception as retry_error:
-                error_msg = f'Ошибка после FloodWait: {str(retry_error)}'
-                logger.error(error_msg)
-                return {
-                    'success': False,
-                    'skipped': False,
-                    'reason': '',
-                    'error': error_msg
-                }
+            # FloodWait не прошёл после всех повторов
+            error_msg = f'FloodWaitError - нужно подождать {e.seconds} секунд'
+            logger.error(error_msg)
+            return {
+                'success': False,
+                'skipped': False,
+                'reason': '',
+                'error': error_msg
+            }
         
         except ChatNotModifiedError as e:
             # Чат не изменён - логируем
@@ -4,16 +4,22 @@
 
 import logging
 import asyncio
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
 from telethon import TelegramClient
+from telethon.tl import types as tl_types
 from telethon.tl.functions.channels import GetParticipantsRequest
 from telethon.tl.types import (
     ChannelParticipantsRecent,
     ChannelParticipantsAdmins,
     ChannelParticipantsBots,
     ChannelParticipantsSearch,
-    InputChannel
+    Channel,
+    InputChannel,
+    UserStatusEmpty,
+    UserStatusLastMonth,
+    UserStatusOffline
 )
 from telethon.errors import (
     FloodWaitError,
@@ -23,11 +29,40 @@ from telethon.errors import (
     ChannelPrivateError
 )
 
+from .antiflood import async_antiflood
 from .async_manager import AsyncManager
-from .database import Database
+from .database import Database, now_iso
 
 logger = logging.getLogger(__name__)
 
+UPSERT_PARSED_USER_SQL = """
+    INSERT INTO parsed_users (user_id, username, first_name, last_name, phone, chat_id, parsed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, chat_id) DO UPDATE SET
+        username = excluded.username,
+        first_name = excluded.first_name,
+        last_name = excluded.last_name,
+        phone = excluded.phone,
+        parsed_at = excluded.parsed_at
+"""
+
+SELECT_PARSED_IDS_SQL = "SELECT user_id FROM parsed_users WHERE chat_id = ?"
+
+# Ссылка на чат: https://t.me/name, t.me/name, @name или name -> name
+_LINK_RE = re.compile(r'^(?:https?://)?(?:t\.me/)?@?(.+?)/?$')
+
+# Статусы, которые фильтр only_active считает неактивными (не в сети больше недели).
+# "Был(а) давно" в актуальном слое TL приходит как UserStatusEmpty; в сборках Telethon,
+# где есть отдельный класс UserStatusLongTimeAgo, он тоже считается неактивным.
+# UserStatusLastWeek намеренно не входит в список: такой пользователь был в сети
+# в пределах недели и проходит порог "< 7 дней".
+INACTIVE_STATUSES = (UserStatusLastMonth, UserStatusEmpty) + tuple(
+    status for status in (getattr(tl_types, 'UserStatusLongTimeAgo', None),) if status is not None
+)
+
+# Максимальная страница channels.getParticipants
+PARTICIPANTS_PAGE_SIZE = 200
+
 
 class Parser:
     """Класс для парсинга участников из чатов Telegram"""
@@ -67,29 +102,58 @@ class Parser:
         Returns:
             Список словарей с данными распарсенных участников
         """
-        client = None
-        parsed_users = []
+        return [
+            user_info
+            async for user_info in self.iter_chat_participants(phone, chat_link, limit, filters)
+        ]
+    
+    async def iter_chat_participants(
+        self,
+        phone: str,
+        chat_link: str,
+        limit: int = 100,
+        filters: Optional[Dict[str, bool]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Парсит участников из чата/канала, отдавая их по мере получения
+        
+        В памяти держится не больше одной страницы участников; новые
+        пользователи сохраняются в БД постранично.
+        
+        Args:
+            phone: Номер телефона аккаунта для парсинга
+            chat_link: Ссылка на чат (@username или полная ссылка)
+            limit: Максимальное количество участников для парсинга
+            filters: Словарь с фильтрами:
+                - only_usernames: только с @username
+                - only_active: только активные (последний вход < 7 дней)
+                - exclude_bots: исключить ботов
+                - exclude_premium: исключить premium
+        
+        Yields:
+            Словари с данными распарсенных участников
+        """
+        batch = []
         
         try:
-            # Создаём клиента
-            client = self.async_manager.create_client(phone)
+            # Берём подключённый клиент из кэша AsyncManager (соединение
+            # переиспользуется между запусками и не закрывается по окончании)
+            client = await self.async_manager.get_client(phone)
             if not client:
                 logger.error(f"Не удалось создать клиент для {phone}")
-                return []
-            
-            # Подключаемся
-            await client.connect()
+                return
             
-            # Проверяем авторизацию
+            # Проверяем авторизацию (неавторизованный клиент не кэшируется)
             if not await client.is_user_authorized():
                 logger.error(f"Аккаунт {phone} не авторизован")
-                return []
+                await self.async_manager.disconnect(client)
+                return
             
             # Получаем chat_id из ссылки
             chat_entity = await self._resolve_chat_link(client, chat_link)
             if not chat_entity:
                 logger.error(f"Не удалось найти чат по ссылке: {chat_link}")
-                return []
+                return
             
             chat_id = chat_entity.id
             logger.info(f"Найден чат: {chat_entity.title} (ID: {chat_id})")
@@ -103,6 +167,19 @@ class Parser:
                     'exclude_premium': False
                 }
             
+            # Канал разрешаем один раз: дальше страницы запрашиваются сырым
+            # GetParticipantsRequest без повторного резолва на каждой итерации
+            input_channel = None
+            if isinstance(chat_entity, Channel):
+                input_channel = await async_antiflood(client.get_input_entity, chat_entity)
+            
+            # Пользователи, уже сохранённые для этого чата: их не пишем в БД повторно
+            rows = await asyncio.to_thread(self.database.fetch_all, SELECT_PARSED_IDS_SQL, (chat_id,))
+            seen = {row[0] for row in rows}
+            
+            # Граница активности для фильтра only_active (was_online в UTC)
+            active_since = datetime.now(timezone.utc) - timedelta(days=7)
+            
             # Парсим участников
             offset = 0
             parsed_count = 0
@@ -110,26 +187,26 @@ class Parser:
             while parsed_count < limit:
                 try:
                     # Получаем участников порциями
-                    participants = await client.get_participants(
-                        chat_entity,
-                        limit=min(100, limit - parsed_count),
-                        offset=offset
+                    page_limit = min(PARTICIPANTS_PAGE_SIZE, limit - parsed_count)
+                    participants, fetched = await self._fetch_participants_page(
+                        client, chat_entity, input_channel, offset, page_limit
                     )
                     
                     if not participants:
                         break
                     
+                    # Одна отметка времени на страницу
+                    parsed_at = now_iso()
+                    
                     # Обрабатываем каждого участника
                     for participant in participants:
                         if parsed_count >= limit:
                             break
                         
                         try:
-                            # Получаем информацию о пользоватеle
-                            user_info = await self.get_user_info(client, participant.id)
-                            
-                            if not user_info:
-                                continue
+                            # get_participants уже возвращает полные объекты User,
+                            # отдельный get_entity на каждого участника не нужен
+                            user_info = self._user_info_from_participant(participant)
                             
                             # Применяем фильтры
                             if filters.get('only_usernames') and not user_info.get('username'):
@@ -143,48 +220,51 @@ class Parser:
                             
                             # Проверка активности (если требуется)
                             if filters.get('only_active'):
-                                # Проверяем статус пользователя
-                                if hasattr(participant, 'status'):
-                                    # Простая проверка - если статус не "давно не был онлайн"
-                                    if hasattr(participant.status, '__class__'):
-                                        status_class = participant.status.__class__.__name__
-                                        if 'UserStatusLongTimeAgo' in status_class or 'UserStatusOffline' in status_class:
-                                            # Проверяем дату последнего входа
-                                            if hasattr(participant.status, 'was_online'):
-                                                was_online = participant.status.was_online
-                                                if was_online:
-                                                    days_ago = (datetime.now(was_online.tzinfo) - was_online).days
-                                                    if days_ago > 7:
-                                                        continue
+                                status = getattr(participant, 'status', None)
+                                if isinstance(status, UserStatusOffline):
+                                    # Был в сети больше 7 дней назад
+                                    if status.was_online and status.was_online < active_since:
+                                        continue
+                                elif isinstance(status, INACTIVE_STATUSES):
+                                    continue
                             
-                            # Сохраняем в БД
-                            self._save_parsed_user(
-                                user_id=user_info['id'],
-                                username=user_info.get('username'),
-                                first_name=user_info.get('first_name'),
-                                last_name=user_info.get('last_name'),
-                                phone=user_info.get('phone'),
-                                chat_id=chat_id
-                            )
+                            # Копим строки новых пользователей, в БД пишем одним пакетом
+                            if user_info['id'] not in seen:
+                                seen.add(user_info['id'])
+                                batch.append((
+                                    user_info['id'],
+                                    user_info.get('username'),
+                                    user_info.get('first_name'),
+                                    user_info.get('last_name'),
+                                    user_info.get('phone'),
+                                    chat_id,
+                                    parsed_at
+                                ))
                             
-                            parsed_users.append(user_info)
                             parsed_count += 1
                             
                             # Логируем прогресс каждые 10 участников
                             if parsed_count % 10 == 0:
                                 logger.info(f"Распарсено {parsed_count}/{limit} участников")
                             
+                            yield user_info
+                            
                         except UserPrivacyRestrictedError:
-                            logger.debug(f"Пользователь {participant.id} ограничил доступ к информации")
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug(f"Пользователь {participant.id} ограничил доступ к информации")
                             continue
                         except Exception as e:
                             logger.warning(f"Ошибка обработки участника {participant.id}: {e}")
                             continue
                     
-                    offset += len(participants)
+                    # Сохраняем страницу участников одной транзакцией
+                    await self._save_parsed_users(batch)
+                    batch = []
+                    
+                    offset += fetched
                     
                     # Если получили меньше участников, чем запросили - достигли конца
-                    if len(participants) < 100:
+                    if input_channel is None or fetched < page_limit:
                         break
                     
                 except FloodWaitError as e:
@@ -198,17 +278,63 @@ class Parser:
                     logger.error(f"Ошибка получения участников: {e}", exc_info=True)
                     break
             
-            logger.info(f"Парсинг завершён. Распарсено участников: {len(parsed_users)}")
-            return parsed_users
+            logger.info(f"Парсинг завершён. Распарсено участников: {parsed_count}")
             
         except Exception as e:
             logger.error(f"Ошибка парсинга чата {chat_link}: {e}", exc_info=True)
-            return parsed_users
             
         finally:
-            # Отключаемся в любом случае
-            if client:
-                await self.async_manager.disconnect(client)
+            # Дописываем страницу, прерванную ошибкой
+            if batch:
+                await self._save_parsed_users(batch)
+    
+    async def _fetch_participants_page(
+        self,
+        client: TelegramClient,
+        chat_entity,
+        input_channel,
+        offset: int,
+        limit: int
+    ) -> Tuple[List[Any], int]:
+        """
+        Получает одну страницу участников чата
+        
+        Args:
+            client: Экземпляр TelegramClient
+            chat_entity: Entity чата
+            input_channel: InputPeer канала или None для обычной группы
+            offset: Смещение в списке участников
+            limit: Размер страницы
+        
+        Returns:
+            Кортеж (список объектов User, количество участников на странице)
+        """
+        if input_channel is None:
+            # Обычные группы отдают всех участников одним запросом
+            users = await async_antiflood(client.get_participants, chat_entity, limit=limit)
+            return list(users), len(users)
+        
+        result = await async_antiflood(client, GetParticipantsRequest(
+            channel=input_channel,
+            filter=ChannelParticipantsRecent(),
+            offset=offset,
+            limit=limit,
+            hash=0
+        ))
+        # В result.users есть и упомянутые пользователи (inviter_id, promoted_by,
+        # kicked_by), поэтому участников берём из result.participants, как
+        # _ParticipantsIter в Telethon
+        users_by_id = {user.id: user for user in result.users}
+        participants = []
+        for participant in result.participants:
+            user_id = getattr(participant, 'user_id', None)
+            if user_id is None:
+                # ChannelParticipantBanned/Left хранят участника в peer
+                user_id = getattr(getattr(participant, 'peer', None), 'user_id', None)
+            user = users_by_id.get(user_id)
+            if user is not None:
+                participants.append(user)
+        return participants, len(result.participants)
     
     async def _resolve_chat_link(self, client: TelegramClient, chat_link: str):
         """
@@ -222,19 +348,13 @@ class Parser:
             Entity чата или None при ошибке
         """
         try:
-            # Очищаем ссылку от лишних символов
-            chat_link = chat_link.strip()
-            
-            # Убираем https://t.me/ или http://t.me/
-            if 't.me/' in chat_link:
-                chat_link = chat_link.split('t.me/')[-1]
-            
-            # Убираем @ если есть
-            if chat_link.startswith('@'):
-                chat_link = chat_link[1:]
+            # Убираем https://t.me/ и @ одним разбором
+            match = _LINK_RE.match(chat_link.strip())
+            if match:
+                chat_link = match.group(1)
             
             # Получаем entity
-            entity = await client.get_entity(chat_link)
+            entity = await async_antiflood(client.get_entity, chat_link)
             return entity
             
         except UsernameNotOccupiedError:
@@ -260,82 +380,58 @@ class Parser:
         """
         try:
             # Получаем информацию о пользователе
-            user = await client.get_entity(user_id)
+            user = await async_antiflood(client.get_entity, user_id)
             
             if not user:
                 return None
             
-            # Формируем результат
-            user_info = {
-                'id': user.id,
-                'username': getattr(user, 'username', None),
-                'first_name': getattr(user, 'first_name', None),
-                'last_name': getattr(user, 'last_name', None),
-                'phone': getattr(user, 'phone', None),
-                'is_bot': getattr(user, 'bot', False),
-                'is_premium': getattr(user, 'premium', False)
-            }
-            
-            return user_info
+            return self._user_info_from_participant(user)
             
         except UserPrivacyRestrictedError:
-            logger.debug(f"Пользователь {user_id} ограничил доступ к информации")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Пользователь {user_id} ограничил доступ к информации")
             return None
         except Exception as e:
             logger.warning(f"Ошибка получения информации о пользователе {user_id}: {e}")
             return None
     
-    def _save_parsed_user(
-        self,
-        user_id: int,
-        username: Optional[str],
-        first_name: Optional[str],
-        last_name: Optional[str],
-        phone: Optional[str],
-        chat_id: int
-    ) -> None:
+    @staticmethod
+    def _user_info_from_participant(participant) -> Dict[str, Any]:
         """
-        Сохраняет распарсенного пользователя в базу данных
+        Формирует словарь с информацией о пользователе без запросов к Telegram
         
         Args:
-            user_id: ID пользователя
-            username: Username пользователя
-            first_name: Имя пользователя
-            last_name: Фамилия пользователя
-            phone: Номер телефона пользователя
-            chat_id: ID чата, из которого распарсен пользователь
+            participant: Объект User (например, из get_participants)
+        
+        Returns:
+            Словарь с информацией о пользователе
+        """
+        return {
+            'id': participant.id,
+            'username': getattr(participant, 'username', None),
+            'first_name': getattr(participant, 'first_name', None),
+            'last_name': getattr(participant, 'last_name', None),
+            'phone': getattr(participant, 'phone', None),
+            'is_bot': getattr(participant, 'bot', False),
+            'is_premium': getattr(participant, 'premium', False)
+        }
+    
+    async def _save_parsed_users(self, rows: List[tuple]) -> None:
+        """
+        Сохраняет пачку распарсенных пользователей одной транзакцией
+        
+        Запись выполняется в отдельном потоке, чтобы не блокировать event loop.
+        
+        Args:
+            rows: Кортежи (user_id, username, first_name, last_name, phone, chat_id, parsed_at)
         """
+        if not rows:
+            return
+        
         try:
-            # Проверяем, не существует ли уже такой пользователь из этого чата
-            check_query = "SELECT id FROM parsed_users WHERE user_id = ? AND chat_id = ? LIMIT 1"
-            existing = self.database.fetch_all(check_query, (user_id, chat_id))
-            
-            if existing:
-                # Обновляем существующую запись
-                update_query = """
-                    UPDATE parsed_users 
-                    SET username = ?, first_name = ?, last_name = ?, phone = ?, parsed_at = ?
-                    WHERE user_id = ? AND chat_id = ?
-                """
-                parsed_at = datetime.now().isoformat()
-                self.database.execute(
-                    update_query,
-                    (username, first_name, last_name, phone, parsed_at, user_id, chat_id)
-                )
-                logger.debug(f"Обновлён пользователь {user_id} из чата {chat_id}")
-            else:
-                # Создаём новую запись
-                insert_query = """
-                    INSERT INTO parsed_users (user_id, username, first_name, last_name, phone, chat_id, parsed_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """
-                parsed_at = datetime.now().isoformat()
-                self.database.execute(
-                    insert_query,
-                    (user_id, username, first_name, last_name, phone, chat_id, parsed_at)
-                )
-                logger.debug(f"Сохранён пользователь {user_id} из чата {chat_id}")
+            await asyncio.to_thread(self.database.execute_many, UPSERT_PARSED_USER_SQL, rows)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Сохранено пользователей: {len(rows)}")
                 
         except Exception as e:
-            logger.error(f"Ошибка сохранения пользователя {user_id} в БД: {e}", exc_info=True)
-
+            logger.error(f"Ошибка пакетного сохранения {len(rows)} пользователей в БД: {e}", exc_info=True)
@@ -2,9 +2,11 @@
 Система загрузки и управления плагинами для TeleMatrix Pro
 """
 
+import json
 import logging
-import importlib
+import os
 import importlib.util
+import inspect
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Type
@@ -15,10 +17,22 @@ from .database import Database
 
 logger = logging.getLogger(__name__)
 
+# Файл с информацией о плагине (name, icon, description) рядом с widget.py
+MANIFEST_FILE = "plugin.json"
+
+# Обязательные ключи информации о плагине
+REQUIRED_INFO_KEYS = ('name', 'icon', 'description')
+
 
 class PluginSystem:
     """Система загрузки и управления плагинами"""
     
+    # Информация get_info() по классам виджетов, общая для всех экземпляров
+    _info_cache: Dict[Type[QWidget], Dict[str, Any]] = {}
+    
+    # Время изменения widget.py, с которым модуль плагина был загружен
+    _module_mtimes: Dict[str, float] = {}
+    
     def __init__(self, account_manager: AccountManager, database: Database):
         """
         Инициализация системы плагинов
@@ -56,31 +70,28 @@ class PluginSystem:
         logger.info(f"Сканирование папки плагинов: {plugins_dir}")
         loaded_count = 0
         
-        # Сканируем все подпапки в директории плагинов
-        for plugin_folder in plugins_dir.iterdir():
-            if not plugin_folder.is_dir():
-                continue
-            
-            # Пропускаем служебные папки
-            if plugin_folder.name.startswith('_'):
-                continue
-            
-            widget_file = plugin_folder / "widget.py"
-            
-            if not widget_file.exists():
-                logger.debug(f"Плагин {plugin_folder.name} не содержит widget.py, пропуск")
-                continue
-            
-            # Пытаемся загрузить плагин
-            try:
-                plugin_info = self._load_plugin(plugin_folder)
-                if plugin_info:
-                    plugin_name = plugin_info['name']
-                    self.plugins[plugin_name] = plugin_info
-                    loaded_count += 1
-                    logger.info(f"✅ Плагин загружен: {plugin_name}")
-            except Exception as e:
-                logger.error(f"❌ Ошибка загрузки плагина {plugin_folder.name}: {e}", exc_info=True)
+        # Сканируем все подпапки в директории плагинов. os.scandir отдаёт тип
+        # записи вместе с именем, поэтому is_dir() не требует отдельного stat
+        with os.scandir(plugins_dir) as entries:
+            for entry in entries:
+                # Пропускаем служебные папки
+                if entry.name.startswith('_') or not entry.is_dir(follow_symlinks=False):
+                    continue
+                
+                if not os.path.isfile(os.path.join(entry.path, "widget.py")):
+                    logger.debug(f"Плагин {entry.name} не содержит widget.py, пропуск")
+                    continue
+                
+                # Пытаемся загрузить плагин
+                try:
+                    plugin_info = self._load_plugin(Path(entry.path))
+                    if plugin_info:
+                        plugin_name = plugin_info['name']
+                        self.plugins[plugin_name] = plugin_info
+                        loaded_count += 1
+                        logger.info(f"✅ Плагин загружен: {plugin_name}")
+                except Exception as e:
+                    logger.error(f"❌ Ошибка загрузки плагина {entry.name}: {e}", exc_info=True)
         
         logger.info(f"Загружено плагинов: {loaded_count}")
         return loaded_count
@@ -89,6 +100,9 @@ class PluginSystem:
         """
         Загружает отдельный плагин из папки
         
+        Если в папке есть plugin.json, информация о плагине берётся из него,
+        а импорт widget.py откладывается до первого создания виджета.
+        
         Args:
             plugin_folder: Путь к папке плагина
         
@@ -105,60 +119,21 @@ class PluginSystem:
         module_path = f"src.plugins.{plugin_name}.widget"
         
         try:
-            # Динамический импорт модуля
-            if module_path in sys.modules:
-                # Если модуль уже загружен, перезагружаем его
-                importlib.reload(sys.modules[module_path])
+            manifest = self._read_manifest(plugin_folder)
+            if manifest is not None:
+                widget_class = None
+                plugin_info = manifest
             else:
-                spec = importlib.util.spec_from_file_location(
-                    module_path,
-                    plugin_folder / "widget.py"
-                )
-                if spec is None or spec.loader is None:
-                    raise ImportError(f"Не удалось создать spec для модуля {module_path}")
-                
-                module = importlib.util.module_from_spec(spec)
-                sys.modules[module_path] = module
-                spec.loader.exec_module(module)
-            
-            # Ищем класс наследующий QWidget
-            widget_class = None
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (isinstance(attr, type) and 
-                    issubclass(attr, QWidget) and 
-                    attr != QWidget):
-                    widget_class = attr
-                    break
-            
-            if widget_class is None:
-                raise ValueError(f"В модуле {module_path} не найден класс наследующий QWidget")
-            
-            # Получаем информацию о плагине через метод get_info()
-            # Создаём временный экземпляр для получения информации
-            try:
-                # Пытаемся создать экземпляр с параметрами
-                temp_widget = widget_class(self.account_manager, self.database)
-            except TypeError:
-                # Если конструктор не принимает параметры, создаём без них
-                temp_widget = widget_class()
-            
-            if not hasattr(temp_widget, 'get_info'):
-                raise ValueError(f"Класс {widget_class.__name__} не имеет метода get_info()")
-            
-            plugin_info = temp_widget.get_info()
-            
-            # Проверяем структуру информации
-            required_keys = ['name', 'icon', 'description']
-            for key in required_keys:
-                if key not in plugin_info:
-                    raise ValueError(f"Метод get_info() не возвращает обязательный ключ: {key}")
+                widget_class = self._import_widget_class(plugin_folder, module_path)
+                plugin_info = self._get_plugin_info(widget_class)
             
             # Сохраняем класс виджета и путь к модулю
             return {
                 'name': plugin_info['name'],
                 'icon': plugin_info['icon'],
                 'description': plugin_info['description'],
+                # Подпись вкладки формируется один раз при загрузке
+                'tab_label': f"{plugin_info['icon']} {plugin_info['name']}",
                 'widget_class': widget_class,
                 'module_path': module_path,
                 'folder': str(plugin_folder)
@@ -168,6 +143,135 @@ class PluginSystem:
             logger.error(f"Ошибка загрузки плагина {plugin_name}: {e}", exc_info=True)
             raise
     
+    @staticmethod
+    def _read_manifest(plugin_folder: Path) -> Optional[Dict[str, Any]]:
+        """
+        Читает plugin.json плагина
+        
+        Args:
+            plugin_folder: Путь к папке плагина
+        
+        Returns:
+            Словарь с информацией о плагине или None, если plugin.json нет
+        
+        Raises:
+            ValueError: Если в plugin.json нет обязательных ключей
+        """
+        try:
+            with open(plugin_folder / MANIFEST_FILE, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        
+        for key in REQUIRED_INFO_KEYS:
+            if key not in manifest:
+                raise ValueError(f"{MANIFEST_FILE} не содержит обязательный ключ: {key}")
+        
+        return manifest
+    
+    @classmethod
+    def _import_widget_class(cls, plugin_folder: Path, module_path: str) -> Type[QWidget]:
+        """
+        Импортирует widget.py плагина и находит в нём класс виджета
+        
+        Уже загруженный модуль переиспользуется, пока widget.py не изменился;
+        изменённый файл исполняется заново. Класс берётся из атрибута модуля
+        WIDGET_CLASS, если он задан, иначе - первый объявленный в модуле
+        наследник QWidget.
+        
+        Args:
+            plugin_folder: Путь к папке плагина
+            module_path: Имя модуля виджета (src.plugins.<папка>.widget)
+        
+        Returns:
+            Класс, наследующий QWidget
+        
+        Raises:
+            ImportError: Если модуль не удалось загрузить
+            ValueError: Если в модуле нет класса, наследующего QWidget
+        """
+        widget_file = plugin_folder / "widget.py"
+        mtime = os.stat(widget_file).st_mtime
+        
+        # Модуль, импортированный в обход PluginSystem, считаем актуальным
+        module = sys.modules.get(module_path)
+        if module is not None:
+            cls._module_mtimes.setdefault(module_path, mtime)
+        
+        # Динамический импорт модуля, если он не загружен или файл изменился
+        if module is None or cls._module_mtimes[module_path] != mtime:
+            spec = importlib.util.spec_from_file_location(module_path, widget_file)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"Не удалось создать spec для модуля {module_path}")
+            
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_path] = module
+            spec.loader.exec_module(module)
+            cls._module_mtimes[module_path] = mtime
+        
+        # Плагин может явно указать класс виджета
+        widget_class = getattr(module, 'WIDGET_CLASS', None)
+        if widget_class is not None:
+            return widget_class
+        
+        # Ищем класс наследующий QWidget среди объявленных в самом модуле
+        # (импортированные классы Qt пропускаем)
+        for attr in module.__dict__.values():
+            if (isinstance(attr, type) and 
+                issubclass(attr, QWidget) and 
+                attr.__module__ == module.__name__):
+                return attr
+        
+        raise ValueError(f"В модуле {module_path} не найден класс наследующий QWidget")
+    
+    def _get_plugin_info(self, widget_class: Type[QWidget]) -> Dict[str, Any]:
+        """
+        Возвращает информацию get_info() класса виджета, кэшируя её на уровне класса
+        
+        Информация берётся без создания виджета из атрибута класса INFO или из
+        get_info(), объявленного как @staticmethod/@classmethod. Временный
+        экземпляр создаётся только для get_info() - обычного метода.
+        
+        Args:
+            widget_class: Класс виджета плагина
+        
+        Returns:
+            Словарь с информацией о плагине
+        
+        Raises:
+            ValueError: Если get_info() отсутствует или не возвращает обязательные ключи
+        """
+        cached = self._info_cache.get(widget_class)
+        if cached is not None:
+            return cached
+        
+        # Получаем информацию о плагине без конструктора Qt-виджета, если возможно
+        get_info = inspect.getattr_static(widget_class, 'get_info', None)
+        plugin_info = getattr(widget_class, 'INFO', None)
+        if plugin_info is None:
+            if get_info is None:
+                raise ValueError(f"Класс {widget_class.__name__} не имеет метода get_info()")
+            
+            if isinstance(get_info, (staticmethod, classmethod)):
+                plugin_info = widget_class.get_info()
+            else:
+                # get_info() - метод экземпляра: создаём временный экземпляр
+                try:
+                    # Пытаемся создать экземпляр с параметрами
+                    temp_widget = widget_class(self.account_manager, self.database)
+                except TypeError:
+                    # Если конструктор не принимает параметры, создаём без них
+                    temp_widget = widget_class()
+                plugin_info = temp_widget.get_info()
+        
+        # Проверяем структуру информации
+        for key in REQUIRED_INFO_KEYS:
+            if key not in plugin_info:
+                raise ValueError(f"Метод get_info() не возвращает обязательный ключ: {key}")
+        
+        self._info_cache[widget_class] = plugin_info
+        return plugin_info
+    
     def get_all_plugins(self) -> List[Dict[str, Any]]:
         """
         Возвращает список всех загруженных плагинов
@@ -180,7 +284,8 @@ class PluginSystem:
             plugins_list.append({
                 'name': plugin_info['name'],
                 'icon': plugin_info['icon'],
-                'description': plugin_info['description']
+                'description': plugin_info['description'],
+                'tab_label': plugin_info['tab_label']
             })
         
         logger.debug(f"Запрошен список плагинов: {len(plugins_list)}")
@@ -201,9 +306,16 @@ class PluginSystem:
             return None
         
         plugin_info = self.plugins[plugin_name]
-        widget_class = plugin_info['widget_class']
         
         try:
+            # Плагины с plugin.json импортируются при первом создании виджета
+            widget_class = plugin_info['widget_class']
+            if widget_class is None:
+                widget_class = plugin_info['widget_class'] = self._import_widget_class(
+                    Path(plugin_info['folder']),
+                    plugin_info['module_path']
+                )
+            
             # Пытаемся создать виджет с параметрами
             try:
                 widget = widget_class(self.account_manager, self.database)
@@ -3,8 +3,11 @@
 """
 
 import logging
+import re
+import time
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
@@ -12,6 +15,49 @@ from .database import Database
 
 logger = logging.getLogger(__name__)
 
+# Запросы объявлены один раз: одна и та же строка попадает в кэш
+# подготовленных выражений соединения (cached_statements)
+PROXY_COLUMNS = (
+    'id', 'account_id', 'proxy_type', 'host', 'port', 'username', 'password',
+    'rotation_enabled', 'rotation_interval', 'last_used', 'created_at'
+)
+SELECT_PROXY_BY_ACCOUNT_SQL = f"SELECT {', '.join(PROXY_COLUMNS)} FROM proxy_settings WHERE account_id = ? LIMIT 1"
+EXISTS_PROXY_SQL = "SELECT EXISTS(SELECT 1 FROM proxy_settings WHERE account_id = ? LIMIT 1)"
+SELECT_ROTATION_SQL = "SELECT proxy_type, rotation_enabled FROM proxy_settings WHERE account_id = ? LIMIT 1"
+SELECT_ALL_PROXIES_SQL = f"SELECT {', '.join(PROXY_COLUMNS)} FROM proxy_settings ORDER BY account_id"
+DELETE_PROXY_SQL = "DELETE FROM proxy_settings WHERE account_id = ? RETURNING id"
+INSERT_PROXY_SQL = """
+    INSERT INTO proxy_settings
+    (account_id, proxy_type, host, port, username, password,
+     rotation_enabled, rotation_interval, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(account_id) DO NOTHING
+    RETURNING id
+"""
+
+# Поля proxy_settings, которые можно менять через update_proxy
+UPDATABLE_FIELDS = (
+    'proxy_type', 'host', 'port', 'username', 'password',
+    'rotation_enabled', 'rotation_interval', 'last_used'
+)
+UPDATE_PROXY_SQL = (
+    "UPDATE proxy_settings SET "
+    + ", ".join(f"{field} = CASE WHEN ? THEN ? ELSE {field} END" for field in UPDATABLE_FIELDS)
+    + " WHERE account_id = ? RETURNING id"
+)
+ROTATE_PROXY_SQL = """
+    UPDATE proxy_settings SET last_used = ?
+    WHERE account_id = ? AND proxy_type = ? AND rotation_enabled
+    RETURNING id
+"""
+
+
+# Адрес для проверки работоспособности прокси
+PROXY_TEST_URL = "http://httpbin.org/ip"
+
+# Схема в начале строки прокси (socks5://, https://, http://)
+_SCHEME_RE = re.compile(r'^(socks5|https|http)://')
+
 
 class ProxyManager:
     """Менеджер для работы с прокси-серверами"""
@@ -22,6 +68,25 @@ class ProxyManager:
     PROXY_TYPE_SOCKS5 = "socks5"
     PROXY_TYPE_MOBILE = "mobile"
     
+    # Допустимые типы прокси: кортеж для сообщений, множество для проверки
+    PROXY_TYPES = (PROXY_TYPE_HTTP, PROXY_TYPE_HTTPS, PROXY_TYPE_SOCKS5, PROXY_TYPE_MOBILE)
+    _VALID_TYPES = frozenset(PROXY_TYPES)
+    
+    # Схема URL по типу прокси (Mobile Proxy обычно работает через HTTP)
+    _TYPE_SCHEMES = {
+        PROXY_TYPE_HTTP: "http",
+        PROXY_TYPE_HTTPS: "https",
+        PROXY_TYPE_SOCKS5: "socks5",
+        PROXY_TYPE_MOBILE: "http",
+    }
+    
+    # Тип прокси по схеме из строки прокси
+    _SCHEME_TYPES = {
+        'socks5': PROXY_TYPE_SOCKS5,
+        'https': PROXY_TYPE_HTTPS,
+        'http': PROXY_TYPE_HTTP,
+    }
+    
     def __init__(self, database: Database):
         """
         Инициализация менеджера прокси
@@ -30,6 +95,10 @@ class ProxyManager:
             database: Экземпляр Database для работы с БД
         """
         self.database = database
+        # Кэш прокси и их URL по account_id; записи через этот менеджер
+        # сбрасывают запись кэша (см. _invalidate). Размер ограничен числом аккаунтов
+        self._cache: Dict[int, Dict[str, Any]] = {}
+        self._url_cache: Dict[int, str] = {}
         self._create_table()
         logger.info("ProxyManager инициализирован")
     
@@ -88,10 +157,9 @@ class ProxyManager:
         """
         try:
             # Валидация типа прокси
-            valid_types = [self.PROXY_TYPE_HTTP, self.PROXY_TYPE_HTTPS, 
-                          self.PROXY_TYPE_SOCKS5, self.PROXY_TYPE_MOBILE]
-            if proxy_type.lower() not in valid_types:
-                raise ValueError(f"Неверный тип прокси: {proxy_type}. Допустимые: {', '.join(valid_types)}")
+            proxy_type_lower = proxy_type.lower()
+            if proxy_type_lower not in self._VALID_TYPES:
+                raise ValueError(f"Неверный тип прокси: {proxy_type}. Допустимые: {', '.join(self.PROXY_TYPES)}")
             
             # Валидация хоста
             if not host or not host.strip():
@@ -101,34 +169,71 @@ class ProxyManager:
             if not isinstance(port, int) or port < 1 or port > 65535:
                 raise ValueError(f"Неверный порт: {port}. Допустимый диапазон: 1-65535")
             
-            # Проверяем, не существует ли уже прокси для этого аккаунта
-            existing = self.get_proxy(account_id)
-            if existing:
-                raise ValueError(f"Прокси для аккаунта {account_id} уже существует. Используйте update_proxy()")
-            
             # Создаём запись в БД
             created_at = datetime.now().isoformat()
-            rotation_enabled = 1 if proxy_type.lower() == self.PROXY_TYPE_MOBILE and rotation_interval > 0 else 0
+            rotation_enabled = 1 if proxy_type_lower == self.PROXY_TYPE_MOBILE and rotation_interval > 0 else 0
             
-            query = """
-                INSERT INTO proxy_settings 
-                (account_id, proxy_type, host, port, username, password, 
-                 rotation_enabled, rotation_interval, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            proxy_id = self.database.execute(
+            # Уникальность account_id обеспечивает ограничение UNIQUE: при конфликте
+            # INSERT ничего не вставляет и не возвращает строку
+            query = INSERT_PROXY_SQL
+            row = self.database.execute_returning(
                 query,
-                (account_id, proxy_type.lower(), host.strip(), port, username, password,
+                (account_id, proxy_type_lower, host.strip(), port, username, password,
                  rotation_enabled, rotation_interval, created_at)
             )
+            if row is None:
+                raise ValueError(f"Прокси для аккаунта {account_id} уже существует. Используйте update_proxy()")
+            proxy_id = row[0]
+            self._invalidate(account_id)
             
             logger.info(f"Прокси добавлен для аккаунта {account_id}: {proxy_type}://{host}:{port}")
             return proxy_id
             
+        except ValueError:
+            # Невалидные данные - ожидаемая ошибка, вызывающий код получит её сам
+            raise
         except Exception as e:
             logger.error(f"Ошибка добавления прокси для аккаунта {account_id}: {e}", exc_info=True)
             raise
     
+    def _invalidate(self, account_id: int) -> None:
+        """
+        Сбрасывает кэшированные прокси и URL аккаунта
+        
+        Args:
+            account_id: ID аккаунта
+        """
+        self._cache.pop(account_id, None)
+        self._url_cache.pop(account_id, None)
+    
+    def proxy_exists(self, account_id: int) -> bool:
+        """
+        Проверяет наличие прокси у аккаунта без чтения всей записи
+        
+        Args:
+            account_id: ID аккаунта
+        
+        Returns:
+            True если прокси для аккаунта настроен
+        """
+        query = EXISTS_PROXY_SQL
+        return bool(self.database.fetch_one(query, (account_id,))[0])
+    
+    @staticmethod
+    def _proxy_from_row(*values: Any) -> Dict[str, Any]:
+        """
+        Собирает словарь прокси из значений колонок PROXY_COLUMNS
+        
+        Args:
+            *values: Значения колонок в порядке PROXY_COLUMNS
+        
+        Returns:
+            Словарь с данными прокси
+        """
+        proxy = dict(zip(PROXY_COLUMNS, values))
+        proxy['rotation_enabled'] = bool(proxy['rotation_enabled'])
+        return proxy
+    
     def get_proxy(self, account_id: int) -> Optional[Dict[str, Any]]:
         """
         Получает прокси для аккаунта
@@ -140,28 +245,23 @@ class ProxyManager:
             Словарь с данными прокси или None, если не найден
         """
         try:
-            query = "SELECT * FROM proxy_settings WHERE account_id = ? LIMIT 1"
-            rows = self.database.fetch_all(query, (account_id,))
+            # Копия, чтобы изменения вызывающего кода не попали в кэш
+            proxy = self._cache.get(account_id)
+            if proxy is not None:
+                return dict(proxy)
+            
+            query = SELECT_PROXY_BY_ACCOUNT_SQL
+            rows = self.database.fetch_all_as(self._proxy_from_row, query, (account_id,))
             
             if rows:
-                row = rows[0]
-                proxy = {
-                    'id': row['id'],
-                    'account_id': row['account_id'],
-                    'proxy_type': row['proxy_type'],
-                    'host': row['host'],
-                    'port': row['port'],
-                    'username': row['username'],
-                    'password': row['password'],
-                    'rotation_enabled': bool(row['rotation_enabled']),
-                    'rotation_interval': row['rotation_interval'],
-                    'last_used': row['last_used'],
-                    'created_at': row['created_at']
-                }
-                logger.debug(f"Прокси найден для аккаунта {account_id}")
-                return proxy
-            
-            logger.debug(f"Прокси не найден для аккаунта {account_id}")
+                proxy = rows[0]
+                self._cache[account_id] = proxy
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Прокси найден для аккаунта {account_id}")
+                return dict(proxy)
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Прокси не найден для аккаунта {account_id}")
             return None
             
         except Exception as e:
@@ -184,30 +284,19 @@ class ProxyManager:
             ValueError: При невалидных данных
         """
         try:
-            # Проверяем существование прокси
-            existing = self.get_proxy(account_id)
-            if not existing:
-                logger.warning(f"Прокси для аккаунта {account_id} не найден для обновления")
-                return False
-            
             # Валидация полей
-            valid_fields = ['proxy_type', 'host', 'port', 'username', 'password', 
-                          'rotation_enabled', 'rotation_interval', 'last_used']
-            update_fields = []
-            update_values = []
+            updates: Dict[str, Any] = {}
             
             for field, value in fields.items():
-                if field not in valid_fields:
+                if field not in UPDATABLE_FIELDS:
                     logger.warning(f"Неизвестное поле для обновления: {field}")
                     continue
                 
                 # Валидация типа прокси
                 if field == 'proxy_type':
-                    valid_types = [self.PROXY_TYPE_HTTP, self.PROXY_TYPE_HTTPS, 
-                                  self.PROXY_TYPE_SOCKS5, self.PROXY_TYPE_MOBILE]
-                    if value.lower() not in valid_types:
-                        raise ValueError(f"Неверный тип прокси: {value}")
                     value = value.lower()
+                    if value not in self._VALID_TYPES:
+                        raise ValueError(f"Неверный тип прокси: {value}")
                 
                 # Валидация хоста
                 if field == 'host':
@@ -220,21 +309,33 @@ class ProxyManager:
                     if not isinstance(value, int) or value < 1 or value > 65535:
                         raise ValueError(f"Неверный порт: {value}")
                 
-                update_fields.append(f"{field} = ?")
-                update_values.append(value)
+                updates[field] = value
             
-            if not update_fields:
+            if not updates:
                 logger.warning("Нет полей для обновления")
                 return False
             
-            # Обновляем запись
-            query = f"UPDATE proxy_settings SET {', '.join(update_fields)} WHERE account_id = ?"
-            update_values.append(account_id)
-            self.database.execute(query, tuple(update_values))
+            # Обновляем запись одним постоянным запросом: для каждого поля
+            # передаётся флаг «обновлять» и значение (None тоже допустимо).
+            # RETURNING показывает, существовал ли прокси
+            params = []
+            for field in UPDATABLE_FIELDS:
+                params.append(field in updates)
+                params.append(updates.get(field))
+            params.append(account_id)
+            
+            self._invalidate(account_id)
+            query = UPDATE_PROXY_SQL
+            if self.database.execute_returning(query, tuple(params)) is None:
+                logger.warning(f"Прокси для аккаунта {account_id} не найден для обновления")
+                return False
             
-            logger.info(f"Прокси обновлён для аккаунта {account_id}: {', '.join(update_fields)}")
+            logger.info(f"Прокси обновлён для аккаунта {account_id}: {', '.join(updates)}")
             return True
             
+        except ValueError:
+            # Невалидные данные - ожидаемая ошибка, вызывающий код получит её сам
+            raise
         except Exception as e:
             logger.error(f"Ошибка обновления прокси для аккаунта {account_id}: {e}", exc_info=True)
             raise
@@ -250,16 +351,13 @@ class ProxyManager:
             True если удалено, False если не найдено
         """
         try:
-            # Проверяем существование
-            existing = self.get_proxy(account_id)
-            if not existing:
+            # Удаляем запись; RETURNING показывает, существовал ли прокси
+            self._invalidate(account_id)
+            query = DELETE_PROXY_SQL
+            if self.database.execute_returning(query, (account_id,)) is None:
                 logger.warning(f"Прокси для аккаунта {account_id} не найден для удаления")
                 return False
             
-            # Удаляем запись
-            query = "DELETE FROM proxy_settings WHERE account_id = ?"
-            self.database.execute(query, (account_id,))
-            
             logger.info(f"Прокси удалён для аккаунта {account_id}")
             return True
             
@@ -275,25 +373,11 @@ class ProxyManager:
             Список словарей с данными прокси
         """
         try:
-            query = "SELECT * FROM proxy_settings ORDER BY account_id"
-            rows = self.database.fetch_all(query)
-            
-            proxies = []
-            for row in rows:
-                proxy = {
-                    'id': row['id'],
-                    'account_id': row['account_id'],
-                    'proxy_type': row['proxy_type'],
-                    'host': row['host'],
-                    'port': row['port'],
-                    'username': row['username'],
-                    'password': row['password'],
-                    'rotation_enabled': bool(row['rotation_enabled']),
-                    'rotation_interval': row['rotation_interval'],
-                    'last_used': row['last_used'],
-                    'created_at': row['created_at']
-                }
-                proxies.append(proxy)
+            query = SELECT_ALL_PROXIES_SQL
+            proxies = self.database.fetch_all_as(self._proxy_from_row, query)
+            # Полный список заодно обновляет кэш (копии - см. get_proxy)
+            self._cache = {proxy['account_id']: dict(proxy) for proxy in proxies}
+            self._url_cache.clear()
             
             logger.info(f"Получено прокси: {len(proxies)}")
             return proxies
@@ -313,25 +397,23 @@ class ProxyManager:
             True если ротация выполнена, False если прокси не найден или не Mobile Proxy
         """
         try:
-            proxy = self.get_proxy(account_id)
-            if not proxy:
-                logger.warning(f"Прокси для аккаунта {account_id} не найден")
-                return False
-            
-            if proxy['proxy_type'] != self.PROXY_TYPE_MOBILE:
-                logger.warning(f"Ротация доступна только для Mobile Proxy. Тип прокси: {proxy['proxy_type']}")
-                return False
-            
-            if not proxy['rotation_enabled']:
-                logger.warning(f"Ротация отключена для прокси аккаунта {account_id}")
-                return False
-            
             # Для Mobile Proxy ротация обычно выполняется через API провайдера
             # Здесь можно добавить вызов API провайдера для смены IP
-            # Обновляем last_used напрямую через SQL
+            # Обновляем last_used одним запросом; условия Mobile Proxy и
+            # включённой ротации проверяются в WHERE
             last_used = datetime.now().isoformat()
-            query = "UPDATE proxy_settings SET last_used = ? WHERE account_id = ?"
-            self.database.execute(query, (last_used, account_id))
+            self._invalidate(account_id)
+            query = ROTATE_PROXY_SQL
+            if self.database.execute_returning(query, (last_used, account_id, self.PROXY_TYPE_MOBILE)) is None:
+                # Запрос не сработал - выясняем причину только для лога
+                proxy = self.database.fetch_one(SELECT_ROTATION_SQL, (account_id,))
+                if not proxy:
+                    logger.warning(f"Прокси для аккаунта {account_id} не найден")
+                elif proxy['proxy_type'] != self.PROXY_TYPE_MOBILE:
+                    logger.warning(f"Ротация доступна только для Mobile Proxy. Тип прокси: {proxy['proxy_type']}")
+                else:
+                    logger.warning(f"Ротация отключена для прокси аккаунта {account_id}")
+                return False
             
             logger.info(f"Ротация IP выполнена для аккаунта {account_id}")
             return True
@@ -351,8 +433,6 @@ class ProxyManager:
         Returns:
             Словарь с результатом проверки: {success: bool, response_time: float, error: str}
         """
-        import time
-        
         result = {
             'success': False,
             'response_time': 0.0,
@@ -366,30 +446,32 @@ class ProxyManager:
                 result['error'] = 'Не удалось распарсить URL прокси'
                 return result
             
-            # Формируем URL для проверки (используем httpbin.org или аналогичный сервис)
-            test_url = "http://httpbin.org/ip"
-            
-            # Настраиваем прокси
+            # Настраиваем прокси. Opener не кэшируется: urllib отправляет
+            # "Connection: close" и открывает новое соединение на каждый запрос
             proxy_handler = urllib.request.ProxyHandler({
                 'http': proxy_url,
                 'https': proxy_url
             })
             opener = urllib.request.build_opener(proxy_handler)
             
+            # HEAD-запрос: для проверки достаточно статуса, тело не скачиваем
+            request = urllib.request.Request(PROXY_TEST_URL, method="HEAD")
+            
             # Выполняем запрос
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
-                response = opener.open(test_url, timeout=timeout)
-                response_time = time.time() - start_time
+                with opener.open(request, timeout=timeout) as response:
+                    status = response.getcode()
+                response_time = time.perf_counter() - start_time
                 
-                if response.getcode() == 200:
+                if status == 200:
                     result['success'] = True
                     result['response_time'] = round(response_time, 2)
                     logger.info(f"Прокси {proxy_url} работает. Время отклика: {result['response_time']} сек")
                 else:
-                    result['error'] = f"HTTP код: {response.getcode()}"
+                    result['error'] = f"HTTP код: {status}"
                     
-            except urllib.error.URLError as e:
+            except (urllib.error.URLError, ConnectionError, TimeoutError) as e:
                 result['error'] = f"Ошибка подключения: {str(e)}"
                 logger.warning(f"Прокси {proxy_url} не работает: {result['error']}")
             except Exception as e:
@@ -402,6 +484,31 @@ class ProxyManager:
         
         return result
     
+    def test_proxies(
+        self,
+        proxy_urls: List[str],
+        timeout: int = 10,
+        max_workers: int = 20
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Проверяет несколько прокси параллельно
+        
+        Args:
+            proxy_urls: Список URL прокси
+            timeout: Таймаут проверки одного прокси в секундах
+            max_workers: Максимальное количество одновременных проверок
+        
+        Returns:
+            Словарь {proxy_url: результат test_proxy()}
+        """
+        urls = list(dict.fromkeys(proxy_urls))
+        if not urls:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls)), thread_name_prefix="proxy-test") as executor:
+            results = executor.map(lambda url: self.test_proxy(url, timeout), urls)
+            return dict(zip(urls, results))
+    
     def format_proxy_url(
         self,
         proxy_type: str,
@@ -425,24 +532,17 @@ class ProxyManager:
         """
         try:
             # Определяем схему в зависимости от типа
-            if proxy_type.lower() == self.PROXY_TYPE_SOCKS5:
-                scheme = "socks5"
-            elif proxy_type.lower() == self.PROXY_TYPE_HTTPS:
-                scheme = "https"
-            elif proxy_type.lower() == self.PROXY_TYPE_MOBILE:
-                scheme = "http"  # Mobile Proxy обычно через HTTP
-            else:
-                scheme = "http"
+            scheme = self._TYPE_SCHEMES.get(proxy_type.lower(), "http")
             
             # Формируем URL
             if username and password:
-                proxy_url = f"{scheme}://{username}:{password}@{host}:{port}"
+                auth = f"{username}:{password}@"
             elif username:
-                proxy_url = f"{scheme}://{username}@{host}:{port}"
+                auth = f"{username}@"
             else:
-                proxy_url = f"{scheme}://{host}:{port}"
+                auth = ""
             
-            return proxy_url
+            return f"{scheme}://{auth}{host}:{port}"
             
         except Exception as e:
             logger.error(f"Ошибка форматирования URL прокси: {e}", exc_info=True)
@@ -467,56 +567,49 @@ class ProxyManager:
         """
         try:
             if not proxy_string or not proxy_string.strip():
-                logger.warning("Пустая строка прокси")
+                logger.debug("Пустая строка прокси")
                 return None
             
             proxy_string = proxy_string.strip()
             
-            # Определяем тип прокси по схеме
+            # Определяем тип прокси по схеме (один разбор вместо цепочки startswith/replace)
             proxy_type = self.PROXY_TYPE_HTTP
-            if proxy_string.startswith('socks5://'):
-                proxy_type = self.PROXY_TYPE_SOCKS5
-                proxy_string = proxy_string.replace('socks5://', '')
-            elif proxy_string.startswith('https://'):
-                proxy_type = self.PROXY_TYPE_HTTPS
-                proxy_string = proxy_string.replace('https://', '')
-            elif proxy_string.startswith('http://'):
-                proxy_type = self.PROXY_TYPE_HTTP
-                proxy_string = proxy_string.replace('http://', '')
+            match = _SCHEME_RE.match(proxy_string)
+            if match:
+                proxy_type = self._SCHEME_TYPES[match.group(1)]
+                proxy_string = proxy_string[match.end():]
             
             # Парсим username:password@host:port
-            # Проверяем наличие @ для авторизации
-            if '@' in proxy_string:
-                auth_part, server_part = proxy_string.rsplit('@', 1)
-                if ':' in auth_part:
-                    username, password = auth_part.split(':', 1)
-                else:
-                    username = auth_part
+            # Авторизация - всё до последнего @, пароль - после первого ':' в ней
+            auth_part, has_auth, server_part = proxy_string.rpartition('@')
+            if has_auth:
+                username, has_password, password = auth_part.partition(':')
+                if not has_password:
                     password = None
             else:
                 username = None
                 password = None
-                server_part = proxy_string
             
             # Парсим host:port
-            if ':' in server_part:
-                host, port_str = server_part.rsplit(':', 1)
-                try:
-                    port = int(port_str)
-                except ValueError:
-                    logger.error(f"Неверный формат порта: {port_str}")
-                    return None
-            else:
-                logger.error(f"Неверный формат прокси: отсутствует порт")
+            host, has_port, port_str = server_part.rpartition(':')
+            if not has_port:
+                logger.debug("Неверный формат прокси: отсутствует порт")
+                return None
+            try:
+                port = int(port_str)
+            except ValueError:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Неверный формат порта: {port_str}")
                 return None
             
             # Валидация
             if not host or not host.strip():
-                logger.error("Хост прокси не может быть пустым")
+                logger.debug("Хост прокси не может быть пустым")
                 return None
             
             if port < 1 or port > 65535:
-                logger.error(f"Неверный порт: {port}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Неверный порт: {port}")
                 return None
             
             result = {
@@ -527,7 +620,8 @@ class ProxyManager:
                 'password': password
             }
             
-            logger.debug(f"Прокси распарсен: {result}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Прокси распарсен: {result}")
             return result
             
         except Exception as e:
@@ -545,17 +639,22 @@ class ProxyManager:
             URL строка прокси или None
         """
         try:
+            proxy_url = self._url_cache.get(account_id)
+            if proxy_url is not None:
+                return proxy_url
+            
             proxy = self.get_proxy(account_id)
             if not proxy:
                 return None
             
-            return self.format_proxy_url(
+            proxy_url = self._url_cache[account_id] = self.format_proxy_url(
                 proxy_type=proxy['proxy_type'],
                 host=proxy['host'],
                 port=proxy['port'],
                 username=proxy['username'],
                 password=proxy['password']
             )
+            return proxy_url
             
         except Exception as e:
             logger.error(f"Ошибка получения URL прокси для аккаунта {account_id}: {e}", exc_info=True)
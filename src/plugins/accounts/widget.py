@@ -5,19 +5,444 @@
 import logging
 import random
 import json
+import re
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-    QTableWidgetItem, QPushButton, QDialog, QFormLayout,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+    QPushButton, QDialog, QFormLayout,
     QLineEdit, QMessageBox, QDialogButtonBox, QComboBox,
-    QLabel, QCheckBox, QHeaderView, QFileDialog, QApplication
+    QLabel, QCheckBox, QHeaderView, QFileDialog, QApplication,
+    QStyledItemDelegate, QStyleOptionViewItem, QStyle
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QPixmap, QPixmapCache
 
 from src.core.account_manager import AccountManager
 from src.core.database import Database
 
 logger = logging.getLogger(__name__)
 
+# Номер телефона в международном формате: необязательный +, затем 8-15 цифр
+_PHONE_RE = re.compile(r'^\+?[1-9]\d{7,14}$')
+
+# Разделители в записи номера: "+7 (999) 123-45-67" -> "+79991234567"
+_PHONE_SEPARATORS_RE = re.compile(r'[\s\-().]')
+
+# API Hash Telegram: 32 шестнадцатеричных символа
+_API_HASH_RE = re.compile(r'^[0-9a-fA-F]{32}$')
+
+
+def _normalize_phone(phone: Any) -> str:
+    """
+    Убирает из номера пробелы, дефисы, точки и скобки
+    
+    Args:
+        phone: Номер телефона в произвольной записи
+    
+    Returns:
+        Номер без разделителей (проверяется по _PHONE_RE)
+    """
+    return _PHONE_SEPARATORS_RE.sub('', str(phone))
+
+# Колонки таблицы аккаунтов
+ACCOUNT_COLUMNS = ("№", "Аватар", "Имя", "Юзернейм", "Отлежка", "Гендер", "Прокси", "Телефон", "Статус")
+NUMBER_COLUMN = 0
+AVATAR_COLUMN = 1
+STATUS_COLUMN = 8
+
+# Строка таблицы аккаунтов: поля идут в порядке ACCOUNT_COLUMNS, поэтому
+# data() берёт значение по номеру колонки (namedtuple не хранит __dict__)
+AccountRow = namedtuple("AccountRow", "number avatar name username delay gender proxy phone status")
+
+# Флаги ячеек таблицы: выделяемые, но не редактируемые
+READONLY_FLAGS = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+
+# Высота строки таблицы аккаунтов (одинаковая для всех строк)
+ACCOUNT_ROW_HEIGHT = 28
+
+# Сколько строк модель достраивает за один fetchMore
+ACCOUNTS_PAGE_SIZE = 200
+
+
+class AccountsTableModel(QAbstractTableModel):
+    """
+    Модель таблицы аккаунтов: строки хранятся как кортежи готовых строк
+    
+    Строки строятся страницами по ACCOUNTS_PAGE_SIZE: QTableView запрашивает
+    следующую страницу через canFetchMore/fetchMore при прокрутке к концу.
+    Порядковый номер (колонка №) не хранится, а берётся из позиции строки,
+    поэтому вставка и удаление отдельных строк не требуют перестройки таблицы.
+    """
+    
+    def __init__(
+        self,
+        row_factory: Callable[[Any, str], AccountRow],
+        parent: Optional[QWidget] = None
+    ):
+        """
+        Инициализация модели
+        
+        Args:
+            row_factory: Строит строку таблицы по ID и телефону аккаунта
+            parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self._row_factory = row_factory
+        self._account_ids: List[Any] = []
+        self._phones: List[str] = []
+        self._rows: List[AccountRow] = []
+    
+    def set_accounts(self, account_ids: Sequence[Any], phones: Sequence[str]) -> None:
+        """
+        Заменяет все аккаунты модели; строятся только строки первой страницы
+        
+        Args:
+            account_ids: ID аккаунтов
+            phones: Телефоны аккаунтов в том же порядке
+        """
+        self.beginResetModel()
+        self._account_ids = list(account_ids)
+        self._phones = list(phones)
+        self._rows = []
+        self._build_rows(min(ACCOUNTS_PAGE_SIZE, len(phones)))
+        self.endResetModel()
+    
+    def _build_rows(self, count: int) -> None:
+        """
+        Достраивает строки до count штук
+        
+        Args:
+            count: Требуемое количество построенных строк
+        """
+        for row in range(len(self._rows), count):
+            self._rows.append(self._row_factory(self._account_ids[row], self._phones[row]))
+    
+    def insert_account(self, row: int, account_id: Any, phone: str) -> None:
+        """
+        Вставляет аккаунт в позицию row
+        
+        Args:
+            row: Позиция вставки
+            account_id: ID аккаунта
+            phone: Телефон аккаунта
+        """
+        self.insert_accounts(row, [account_id], [phone])
+    
+    def insert_accounts(self, row: int, account_ids: Sequence[Any], phones: Sequence[str]) -> None:
+        """
+        Вставляет несколько аккаунтов подряд начиная с позиции row
+        
+        Args:
+            row: Позиция вставки
+            account_ids: ID аккаунтов
+            phones: Телефоны аккаунтов в том же порядке
+        """
+        count = len(phones)
+        if not count:
+            return
+        
+        row = max(0, min(row, len(self._phones)))
+        self._account_ids[row:row] = account_ids
+        self._phones[row:row] = phones
+        
+        # За пределами построенных строк аккаунты появятся через fetchMore
+        if row > len(self._rows):
+            return
+        
+        self.beginInsertRows(QModelIndex(), row, row + count - 1)
+        self._rows[row:row] = [
+            self._row_factory(account_id, phone)
+            for account_id, phone in zip(account_ids, phones)
+        ]
+        self.endInsertRows()
+        self._renumber_from(row + count)
+    
+    def remove_rows(self, rows: Sequence[int]) -> None:
+        """
+        Удаляет строки по номерам
+        
+        Args:
+            rows: Номера строк (в любом порядке)
+        """
+        rows = sorted({row for row in rows if 0 <= row < len(self._rows)}, reverse=True)
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            del self._account_ids[row]
+            del self._phones[row]
+            self.endRemoveRows()
+        
+        if rows:
+            self._renumber_from(rows[-1])
+    
+    def _renumber_from(self, row: int) -> None:
+        """
+        Сообщает представлению, что номера строк начиная с row изменились
+        
+        Args:
+            row: Первая строка со сдвинутым номером
+        """
+        if row < len(self._rows):
+            self.dataChanged.emit(
+                self.index(row, NUMBER_COLUMN),
+                self.index(len(self._rows) - 1, NUMBER_COLUMN),
+                [Qt.ItemDataRole.DisplayRole]
+            )
+    
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and len(self._rows) < len(self._phones)
+    
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        
+        first = len(self._rows)
+        last = min(first + ACCOUNTS_PAGE_SIZE, len(self._phones))
+        if first >= last:
+            return
+        
+        self.beginInsertRows(QModelIndex(), first, last - 1)
+        self._build_rows(last)
+        self.endInsertRows()
+    
+    def phone(self, row: int) -> Optional[str]:
+        """
+        Возвращает телефон аккаунта в строке
+        
+        Args:
+            row: Номер строки
+        
+        Returns:
+            Телефон или None, если строки нет
+        """
+        if 0 <= row < len(self._rows):
+            return self._rows[row].phone
+        return None
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(ACCOUNT_COLUMNS)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == NUMBER_COLUMN:
+                return str(index.row() + 1)
+            return self._rows[index.row()][column]
+        if role == Qt.ItemDataRole.TextAlignmentRole and column == AVATAR_COLUMN:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+    
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return ACCOUNT_COLUMNS[section]
+        return super().headerData(section, orientation, role)
+    
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        # Ячейки только для чтения
+        return READONLY_FLAGS
+
+
+class StatusDelegate(QStyledItemDelegate):
+    """Рисует статус аккаунта зелёной плашкой без отдельного виджета в ячейке"""
+    
+    _BACKGROUND = QColor("#4CAF50")
+    _FOREGROUND = QColor("white")
+    
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        # Фон ячейки (в том числе выделение) рисует стиль, поверх - плашка
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, opt, painter, opt.widget)
+        
+        # Плашки одинаковы во всех строках: рисуем одну на размер ячейки и
+        # текст, дальше при прокрутке копируем готовый QPixmap
+        size = option.rect.size()
+        ratio = painter.device().devicePixelRatioF()
+        key = f"status_pill_{size.width()}x{size.height()}@{ratio}_{opt.font.key()}_{opt.text}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = self._render_pill(size, ratio, opt.font, opt.text)
+            QPixmapCache.insert(key, pixmap)
+        painter.drawPixmap(option.rect.topLeft(), pixmap)
+    
+    def _render_pill(self, size, ratio: float, font, text: str) -> QPixmap:
+        """
+        Рисует плашку статуса в прозрачный QPixmap
+        
+        Args:
+            size: Размер ячейки (QSize)
+            ratio: Device pixel ratio устройства отрисовки
+            font: Шрифт ячейки (QFont)
+            text: Текст статуса
+        
+        Returns:
+            QPixmap с плашкой
+        """
+        pixmap = QPixmap(size * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        rect = pixmap.rect()
+        rect.setSize(size)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._BACKGROUND)
+        painter.drawRoundedRect(rect.adjusted(2, 2, -2, -2), 3, 3)
+        painter.setPen(self._FOREGROUND)
+        painter.setFont(font)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.end()
+        return pixmap
+
+
+class ImportThread(QThread):
+    """Поток импорта аккаунтов из JSON файла"""
+    
+    # Сигналы для общения с UI
+    accounts_imported = pyqtSignal(list)  # [(account_id, phone), ...]
+    finished_signal = pyqtSignal(int, int, int)  # импортировано, пропущено, ошибок
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, account_manager: AccountManager, file_path: str):
+        """
+        Инициализация потока импорта
+        
+        Args:
+            account_manager: Экземпляр AccountManager для добавления аккаунтов
+            file_path: Путь к JSON файлу
+        """
+        super().__init__()
+        self.account_manager = account_manager
+        self.file_path = file_path
+    
+    def run(self):
+        """Чтение файла и добавление аккаунтов в потоке"""
+        try:
+            # Читаем и парсим JSON файл
+            try:
+                with open(self.file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except json.JSONDecodeError as e:
+                error_msg = f"Ошибка парсинга JSON: {str(e)}"
+                logger.error(error_msg)
+                self.error_signal.emit(f"Файл содержит невалидный JSON:\n{error_msg}")
+                return
+            except Exception as e:
+                error_msg = f"Ошибка чтения файла: {str(e)}"
+                logger.error(error_msg, exc_info=True)
+                self.error_signal.emit(error_msg)
+                return
+            
+            # Проверяем, что данные - это список
+            if not isinstance(data, list):
+                self.error_signal.emit("JSON файл должен содержать массив объектов")
+                return
+            
+            # Счётчики для результата
+            imported_count = 0
+            skipped_count = 0
+            error_count = 0
+            to_insert = []
+            
+            # Проверяем каждую запись
+            for idx, account_data in enumerate(data, 1):
+                try:
+                    # Валидация обязательных полей
+                    if not isinstance(account_data, dict):
+                        logger.warning(f"Запись {idx} не является объектом, пропуск")
+                        skipped_count += 1
+                        continue
+                    
+                    phone = account_data.get('phone')
+                    api_id_str = account_data.get('api_id')
+                    api_hash = account_data.get('api_hash')
+                    session_string = account_data.get('session_string')
+                    
+                    # Проверка обязательных полей
+                    if not phone:
+                        logger.warning(f"Запись {idx}: отсутствует поле 'phone', пропуск")
+                        skipped_count += 1
+                        continue
+                    
+                    # Номер неверного формата отсеиваем до обращения к БД
+                    phone_normalized = _normalize_phone(phone)
+                    if not _PHONE_RE.match(phone_normalized):
+                        logger.warning(f"Запись {idx}: неверный формат номера '{phone}', пропуск")
+                        skipped_count += 1
+                        continue
+                    
+                    if not api_id_str:
+                        logger.warning(f"Запись {idx}: отсутствует поле 'api_id', пропуск")
+                        skipped_count += 1
+                        continue
+                    
+                    if not api_hash:
+                        logger.warning(f"Запись {idx}: отсутствует поле 'api_hash', пропуск")
+                        skipped_count += 1
+                        continue
+                    
+                    if not _API_HASH_RE.match(str(api_hash).strip()):
+                        logger.warning(f"Запись {idx}: 'api_hash' должен состоять из 32 шестнадцатеричных символов, пропуск")
+                        skipped_count += 1
+                        continue
+                    
+                    # Преобразуем api_id в int
+                    try:
+                        api_id = int(api_id_str)
+                    except (ValueError, TypeError):
+                        logger.warning(f"Запись {idx}: 'api_id' должен быть числом, пропуск")
+                        skipped_count += 1
+                        continue
+                    
+                    # Преобразуем session_string в None если пустая строка
+                    if session_string and isinstance(session_string, str) and not session_string.strip():
+                        session_string = None
+                    
+                    # Запись прошла проверку - добавим её вместе с остальными
+                    to_insert.append((
+                        phone_normalized,
+                        api_id,
+                        str(api_hash).strip(),
+                        session_string.strip() if session_string else None
+                    ))
+                
+                except Exception as e:
+                    logger.error(f"Ошибка обработки записи {idx}: {e}", exc_info=True)
+                    error_count += 1
+            
+            # Добавляем все проверенные записи одной транзакцией
+            try:
+                inserted = self.account_manager.add_accounts_bulk(to_insert)
+            except Exception as e:
+                logger.error(f"Ошибка импорта аккаунтов: {e}", exc_info=True)
+                error_count += len(to_insert)
+            else:
+                imported_count = len(inserted)
+                # Дубликаты (уже в базе или повторы в файле) пропускаются
+                duplicates = len(to_insert) - imported_count
+                if duplicates:
+                    logger.warning(f"Пропущено аккаунтов с существующими номерами: {duplicates}")
+                skipped_count += duplicates
+                if inserted:
+                    self.accounts_imported.emit(inserted)
+            
+            logger.info(f"Импорт JSON завершён: импортировано={imported_count}, пропущено={skipped_count}, ошибок={error_count}")
+            self.finished_signal.emit(imported_count, skipped_count, error_count)
+        
+        except Exception as e:
+            error_msg = f"Критическая ошибка импорта: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            self.error_signal.emit(error_msg)
+
 
 class AccountsWidget(QWidget):
     """Виджет для управления Telegram аккаунтами"""
@@ -33,6 +458,9 @@ class AccountsWidget(QWidget):
         super().__init__()
         self.account_manager = account_manager
         self.database = database
+        # Placeholder колонки по ID аккаунта: генерируются один раз и не
+        # меняются при перезагрузке таблицы
+        self._placeholder_cache: Dict[Any, Tuple[str, str, str]] = {}
         self.init_ui()
         self.load_accounts()
         logger.info("AccountsWidget инициализирован")
@@ -146,12 +574,11 @@ class AccountsWidget(QWidget):
         second_panel.addStretch()
         layout.addLayout(second_panel)
         
-        # ТАБЛИЦА аккаунтов
-        self.table = QTableWidget()
-        self.table.setColumnCount(9)
-        self.table.setHorizontalHeaderLabels([
-            "№", "Аватар", "Имя", "Юзернейм", "Отлежка", "Гендер", "Прокси", "Телефон", "Статус"
-        ])
+        # ТАБЛИЦА аккаунтов: QTableView запрашивает у модели только видимые ячейки
+        self._model = AccountsTableModel(self._account_row, self)
+        self.table = QTableView()
+        self.table.setModel(self._model)
+        self.table.setItemDelegateForColumn(STATUS_COLUMN, StatusDelegate(self.table))
         
         # Настройка ширины колонок (адаптивная)
         header = self.table.horizontalHeader()
@@ -159,17 +586,24 @@ class AccountsWidget(QWidget):
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)  # №
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)  # Аватар
         header.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)  # Гендер
-        # Гибкие колонки (растягиваются)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # Имя
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)  # Юзернейм
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)  # Отлежка
-        header.setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)  # Прокси
-        header.setSectionResizeMode(7, QHeaderView.ResizeMode.Stretch)  # Телефон
+        # Колонки с шириной по содержимому, вычисленной один раз при загрузке
+        # (см. load_accounts); пользователь может менять их ширину
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Interactive)  # Имя
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Interactive)  # Юзернейм
+        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Interactive)  # Отлежка
+        header.setSectionResizeMode(6, QHeaderView.ResizeMode.Interactive)  # Прокси
+        header.setSectionResizeMode(7, QHeaderView.ResizeMode.Interactive)  # Телефон
+        # Последняя колонка забирает оставшееся место
         header.setSectionResizeMode(8, QHeaderView.ResizeMode.Stretch)  # Статус
         
-        # Включаем чекбоксы для выбора строк
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SelectionMode.MultiSelection)
+        # Строки одной высоты: представлению не нужен sizeHint каждой строки
+        vertical_header = self.table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(ACCOUNT_ROW_HEIGHT)
+        
+        # Выбор строк целиком; несколько строк - через Ctrl/Shift
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
         
         layout.addWidget(self.table)
         
@@ -199,66 +633,51 @@ class AccountsWidget(QWidget):
         ]
         return random.choice(proxies)
     
+    def _account_row(self, account_id: Any, phone: str) -> AccountRow:
+        """
+        Строит строку таблицы аккаунтов с placeholder данными
+        
+        Args:
+            account_id: ID аккаунта
+            phone: Телефон аккаунта
+        
+        Returns:
+            AccountRow со значениями колонок ACCOUNT_COLUMNS
+        """
+        placeholders = self._placeholder_cache.get(account_id)
+        if placeholders is None:
+            placeholders = self._placeholder_cache[account_id] = (
+                self.generate_placeholder_delay(),  # Отлежка (случайное значение)
+                self.generate_placeholder_gender(), # Гендер (случайно)
+                self.generate_placeholder_proxy(),  # Прокси (placeholder)
+            )
+        delay, gender, proxy = placeholders
+        
+        return AccountRow(
+            number=None,                            # № (позиция строки в модели)
+            avatar="👤",                            # Аватар (placeholder)
+            name=f"User {account_id}",              # Имя (placeholder)
+            username=f"user_{account_id}",          # Юзернейм (placeholder)
+            delay=delay,                            # Отлежка
+            gender=gender,                          # Гендер
+            proxy=proxy,                            # Прокси
+            phone=phone,                            # Телефон
+            status="Без ограничений",               # Статус
+        )
+    
     def load_accounts(self):
         """Загружает список аккаунтов из AccountManager в таблицу с placeholder данными"""
         try:
-            accounts = self.account_manager.get_all_accounts()
+            accounts = self.account_manager.get_accounts_columnar()
+            account_ids = accounts['id']
+            phones = accounts['phone']
             
-            # Очищаем таблицу
-            self.table.setRowCount(0)
+            # Модель строит строки страницами (см. AccountsTableModel)
+            self._model.set_accounts(account_ids, phones)
+            # Ширины Interactive колонок считаются один раз на загрузку
+            self.table.resizeColumnsToContents()
             
-            # Заполняем таблицу
-            for idx, account in enumerate(accounts, 1):
-                row = self.table.rowCount()
-                self.table.insertRow(row)
-                
-                # №
-                number_item = QTableWidgetItem(str(idx))
-                number_item.setFlags(number_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 0, number_item)
-                
-                # Аватар (QLabel с placeholder "👤")
-                avatar_label = QLabel("👤")
-                avatar_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setCellWidget(row, 1, avatar_label)
-                
-                # Имя (placeholder)
-                name_item = QTableWidgetItem(f"User {account['id']}")
-                name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 2, name_item)
-                
-                # Юзернейм (placeholder)
-                username_item = QTableWidgetItem(f"user_{account['id']}")
-                username_item.setFlags(username_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 3, username_item)
-                
-                # Отлежка (случайное значение)
-                delay_item = QTableWidgetItem(self.generate_placeholder_delay())
-                delay_item.setFlags(delay_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 4, delay_item)
-                
-                # Гендер (случайно)
-                gender_item = QTableWidgetItem(self.generate_placeholder_gender())
-                gender_item.setFlags(gender_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 5, gender_item)
-                
-                # Прокси (placeholder)
-                proxy_item = QTableWidgetItem(self.generate_placeholder_proxy())
-                proxy_item.setFlags(proxy_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 6, proxy_item)
-                
-                # Телефон
-                phone_item = QTableWidgetItem(account['phone'])
-                phone_item.setFlags(phone_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 7, phone_item)
-                
-                # Статус (зелёная плашка "Без ограничений")
-                status_label = QLabel("Без ограничений")
-                status_label.setStyleSheet("background-color: #4CAF50; color: white; padding: 2px 8px; border-radius: 3px;")
-                status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setCellWidget(row, 8, status_label)
-            
-            logger.info(f"Загружено аккаунтов в таблицу: {len(accounts)}")
+            logger.info(f"Загружено аккаунтов в таблицу: {len(phones)}")
             
         except Exception as e:
             logger.error(f"Ошибка загрузки аккаунтов: {e}", exc_info=True)
@@ -286,7 +705,7 @@ class AccountsWidget(QWidget):
         layout.addRow("API ID:", api_id_input)
         
         api_hash_input = QLineEdit()
-        api_hash_input.setPlaceholderText("abcdef1234567890")
+        api_hash_input.setPlaceholderText("0123456789abcdef0123456789abcdef")
         layout.addRow("API Hash:", api_hash_input)
         
         session_input = QLineEdit()
@@ -305,7 +724,7 @@ class AccountsWidget(QWidget):
         
         # Показываем диалог
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            phone = phone_input.text().strip()
+            phone = _normalize_phone(phone_input.text().strip())
             api_id_str = api_id_input.text().strip()
             api_hash = api_hash_input.text().strip()
             session_string = session_input.text().strip() or None
@@ -315,6 +734,10 @@ class AccountsWidget(QWidget):
                 QMessageBox.warning(self, "Ошибка", "Введите номер телефона")
                 return
             
+            if not _PHONE_RE.match(phone):
+                QMessageBox.warning(self, "Ошибка", "Неверный формат номера телефона. Пример: +79001234567")
+                return
+            
             if not api_id_str:
                 QMessageBox.warning(self, "Ошибка", "Введите API ID")
                 return
@@ -329,6 +752,10 @@ class AccountsWidget(QWidget):
                 QMessageBox.warning(self, "Ошибка", "Введите API Hash")
                 return
             
+            if not _API_HASH_RE.match(api_hash):
+                QMessageBox.warning(self, "Ошибка", "API Hash должен состоять из 32 шестнадцатеричных символов")
+                return
+            
             # Добавляем аккаунт
             try:
                 account_id = self.account_manager.add_account(
@@ -344,8 +771,8 @@ class AccountsWidget(QWidget):
                     f"Аккаунт успешно добавлен! ID: {account_id}"
                 )
                 
-                # Обновляем таблицу
-                self.load_accounts()
+                # Новые аккаунты идут первыми (сортировка по дате создания)
+                self._model.insert_account(0, account_id, phone)
                 
             except ValueError as e:
                 QMessageBox.warning(self, "Ошибка", str(e))
@@ -359,9 +786,7 @@ class AccountsWidget(QWidget):
     
     def delete_selected(self):
         """Удаление выбранных аккаунтов"""
-        selected_rows = set()
-        for item in self.table.selectedItems():
-            selected_rows.add(item.row())
+        selected_rows = {index.row() for index in self.table.selectionModel().selectedRows()}
         
         if not selected_rows:
             QMessageBox.warning(
@@ -381,28 +806,27 @@ class AccountsWidget(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            deleted_count = 0
+            deleted_rows = []
             for row in sorted(selected_rows, reverse=True):
-                # Получаем телефон из таблицы (колонка 7)
-                phone_item = self.table.item(row, 7)
-                if phone_item:
-                    phone = phone_item.text()
+                # Получаем телефон из модели таблицы
+                phone = self._model.phone(row)
+                if phone:
                     try:
                         success = self.account_manager.delete_account(phone)
                         if success:
-                            deleted_count += 1
+                            deleted_rows.append(row)
                     except Exception as e:
                         logger.error(f"Ошибка удаления аккаунта {phone}: {e}", exc_info=True)
             
-            if deleted_count > 0:
-                QMessageBox.information(self, "Успех", f"Удалено аккаунтов: {deleted_count}")
-                # Обновляем таблицу
-                self.load_accounts()
+            if deleted_rows:
+                # Убираем из таблицы только удалённые строки
+                self._model.remove_rows(deleted_rows)
+                QMessageBox.information(self, "Успех", f"Удалено аккаунтов: {len(deleted_rows)}")
             else:
                 QMessageBox.warning(self, "Ошибка", "Не удалось удалить аккаунты")
     
     def import_json(self):
-        """Импортирует аккаунты из JSON файла"""
+        """Импортирует аккаунты из JSON файла в фоновом потоке"""
         try:
             # Открываем диалог выбора файла
             file_path, _ = QFileDialog.getOpenFileName(
@@ -415,147 +839,77 @@ class AccountsWidget(QWidget):
             if not file_path:
                 return
             
-            # Читаем и парсим JSON файл
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            except json.JSONDecodeError as e:
-                error_msg = f"Ошибка парсинга JSON: {str(e)}"
-                logger.error(error_msg)
-                QMessageBox.critical(
-                    self,
-                    "Ошибка",
-                    f"Файл содержит невалидный JSON:\n{error_msg}"
-                )
-                return
-            except Exception as e:
-                error_msg = f"Ошибка чтения файла: {str(e)}"
-                logger.error(error_msg, exc_info=True)
-                QMessageBox.critical(
-                    self,
-                    "Ошибка",
-                    error_msg
-                )
-                return
-            
-            # Проверяем, что данные - это список
-            if not isinstance(data, list):
-                QMessageBox.warning(
-                    self,
-                    "Ошибка",
-                    "JSON файл должен содержать массив объектов"
-                )
-                return
-            
-            # Счётчики для результата
-            imported_count = 0
-            skipped_count = 0
-            error_count = 0
-            
-            # Обрабатываем каждый аккаунт
-            for idx, account_data in enumerate(data, 1):
-                try:
-                    # Валидация обязательных полей
-                    if not isinstance(account_data, dict):
-                        logger.warning(f"Запись {idx} не является объектом, пропуск")
-                        skipped_count += 1
-                        continue
-                    
-                    phone = account_data.get('phone')
-                    api_id_str = account_data.get('api_id')
-                    api_hash = account_data.get('api_hash')
-                    session_string = account_data.get('session_string')
-                    
-                    # Проверка обязательных полей
-                    if not phone:
-                        logger.warning(f"Запись {idx}: отсутствует поле 'phone', пропуск")
-                        skipped_count += 1
-                        continue
-                    
-                    if not api_id_str:
-                        logger.warning(f"Запись {idx}: отсутствует поле 'api_id', пропуск")
-                        skipped_count += 1
-                        continue
-                    
-                    if not api_hash:
-                        logger.warning(f"Запись {idx}: отсутствует поле 'api_hash', пропуск")
-                        skipped_count += 1
-                        continue
-                    
-                    # Преобразуем api_id в int
-                    try:
-                        api_id = int(api_id_str)
-                    except (ValueError, TypeError):
-                        logger.warning(f"Запись {idx}: 'api_id' должен быть числом, пропуск")
-                        skipped_count += 1
-                        continue
-                    
-                    # Преобразуем session_string в None если пустая строка
-                    if session_string and isinstance(session_string, str) and not session_string.strip():
-                        session_string = None
-                    
-                    # Пытаемся добавить аккаунт
-                    try:
-                        account_id = self.account_manager.add_account(
-                            phone=str(phone).strip(),
-                            api_id=api_id,
-                            api_hash=str(api_hash).strip(),
-                            session_string=session_string.strip() if session_string else None
-                        )
-                        imported_count += 1
-                        logger.info(f"Импортирован аккаунт: {phone} (ID: {account_id})")
-                        
-                    except ValueError as e:
-                        # Дубликат или другая ошибка валидации
-                        logger.warning(f"Пропущен аккаунт {phone}: {str(e)}")
-                        skipped_count += 1
-                        
-                    except Exception as e:
-                        # Неожиданная ошибка
-                        logger.error(f"Ошибка импорта аккаунта {phone}: {e}", exc_info=True)
-                        error_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"Ошибка обработки записи {idx}: {e}", exc_info=True)
-                    error_count += 1
-            
-            # Показываем результат
-            result_message = f"Импорт завершён!\n\n"
-            result_message += f"Импортировано: {imported_count}\n"
-            result_message += f"Пропущено: {skipped_count}\n"
-            if error_count > 0:
-                result_message += f"Ошибок: {error_count}"
-            
-            if imported_count > 0:
-                QMessageBox.information(
-                    self,
-                    "Импорт завершён",
-                    result_message
-                )
-                # Обновляем таблицу после успешного импорта
-                self.load_accounts()
-            else:
-                QMessageBox.warning(
-                    self,
-                    "Импорт завершён",
-                    result_message
-                )
-            
-            logger.info(f"Импорт JSON завершён: импортировано={imported_count}, пропущено={skipped_count}, ошибок={error_count}")
+            # Чтение файла и запись в БД идут в потоке, UI остаётся отзывчивым
+            self.import_json_button.setEnabled(False)
+            self.import_thread = ImportThread(self.account_manager, file_path)
+            self.import_thread.accounts_imported.connect(self._on_accounts_imported)
+            self.import_thread.finished_signal.connect(self._on_import_finished)
+            self.import_thread.error_signal.connect(self._on_import_error)
+            self.import_thread.start()
             
         except Exception as e:
             error_msg = f"Критическая ошибка импорта: {str(e)}"
             logger.error(error_msg, exc_info=True)
+            self.import_json_button.setEnabled(True)
             QMessageBox.critical(
                 self,
                 "Ошибка",
                 error_msg
             )
     
+    def _on_accounts_imported(self, inserted: list):
+        """Обработчик импорта аккаунтов: строки добавляются одной вставкой"""
+        # Новые аккаунты идут первыми (сортировка по дате создания, затем по ID)
+        inserted = inserted[::-1]
+        self._model.insert_accounts(
+            0,
+            [account_id for account_id, _ in inserted],
+            [phone for _, phone in inserted]
+        )
+        for account_id, phone in inserted:
+            logger.info(f"Импортирован аккаунт: {phone} (ID: {account_id})")
+    
+    def _on_import_finished(self, imported_count: int, skipped_count: int, error_count: int):
+        """Обработчик завершения импорта"""
+        self.import_json_button.setEnabled(True)
+        
+        # Показываем результат
+        result_lines = [
+            "Импорт завершён!",
+            "",
+            f"Импортировано: {imported_count}",
+            f"Пропущено: {skipped_count}",
+        ]
+        if error_count > 0:
+            result_lines.append(f"Ошибок: {error_count}")
+        result_message = "\n".join(result_lines)
+        
+        if imported_count > 0:
+            QMessageBox.information(
+                self,
+                "Импорт завершён",
+                result_message
+            )
+        else:
+            QMessageBox.warning(
+                self,
+                "Импорт завершён",
+                result_message
+            )
+    
+    def _on_import_error(self, error_msg: str):
+        """Обработчик ошибки импорта"""
+        self.import_json_button.setEnabled(True)
+        QMessageBox.critical(
+            self,
+            "Ошибка",
+            error_msg
+        )
+    
     def check_selected_account(self):
         """Проверяет выбранный аккаунт через AsyncManager"""
         # Получаем выбранную строку
-        current_row = self.table.currentRow()
+        current_row = self.table.currentIndex().row()
         
         if current_row < 0:
             QMessageBox.warning(
@@ -565,14 +919,12 @@ class AccountsWidget(QWidget):
             )
             return
         
-        # Получаем телефон из таблицы (колонка 7)
-        phone_item = self.table.item(current_row, 7)
-        if not phone_item:
+        # Получаем телефон из модели таблицы
+        phone = self._model.phone(current_row)
+        if not phone:
             QMessageBox.warning(self, "Ошибка", "Не удалось получить данные аккаунта")
             return
         
-        phone = phone_item.text()
-        
         # Находим главное окно приложения
         main_window = None
         for widget in QApplication.topLevelWidgets():
@@ -594,7 +946,7 @@ class AccountsWidget(QWidget):
     def authenticate_selected_account(self):
         """Авторизует выбранный аккаунт через AsyncManager"""
         # Получаем выбранную строку
-        current_row = self.table.currentRow()
+        current_row = self.table.currentIndex().row()
         
         if current_row < 0:
             QMessageBox.warning(
@@ -604,14 +956,12 @@ class AccountsWidget(QWidget):
             )
             return
         
-        # Получаем телефон из таблицы (колонка 7)
-        phone_item = self.table.item(current_row, 7)
-        if not phone_item:
+        # Получаем телефон из модели таблицы
+        phone = self._model.phone(current_row)
+        if not phone:
             QMessageBox.warning(self, "Ошибка", "Не удалось получить данные аккаунта")
             return
         
-        phone = phone_item.text()
-        
         # Находим главное окно приложения
         main_window = None
         for widget in QApplication.topLevelWidgets():
@@ -3,19 +3,17 @@
 """
 
 import logging
-import asyncio
+from concurrent.futures import CancelledError
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
     QSpinBox, QPushButton, QTextEdit, QLabel, QGroupBox,
     QListWidget, QListWidgetItem, QFileDialog, QDialog,
-    QDialogButtonBox
+    QDialogButtonBox, QApplication
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 
 from src.core.account_manager import AccountManager
 from src.core.database import Database
-from src.core.async_manager import AsyncManager
-from src.core.inviter import Inviter
 
 logger = logging.getLogger(__name__)
 
@@ -63,11 +61,14 @@ class InvitingThread(QThread):
         self.user_list = user_list
         self.delay = delay
         self._stop_requested = False
+        self._future = None  # Операция в фоновом loop AsyncManager
         self.log_handler = None
     
     def stop(self):
-        """Запрашивает остановку потока"""
+        """Запрашивает остановку потока (отменяет инвайтинг в фоновом loop)"""
         self._stop_requested = True
+        if self._future is not None:
+            self._future.cancel()
     
     def run(self):
         """Запуск инвайтинга в потоке"""
@@ -79,12 +80,9 @@ class InvitingThread(QThread):
             inviter_logger.addHandler(self.log_handler)
             inviter_logger.setLevel(logging.INFO)
             
-            # Создаём новый event loop для потока
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Запускаем инвайтинг
-            stats = loop.run_until_complete(
+            # Инвайтинг выполняется в общем фоновом loop AsyncManager: клиенты
+            # Telegram остаются подключёнными между запусками
+            self._future = self.inviter.async_manager.run_in_worker(
                 self.inviter.invite_users(
                     phone=self.phone,
                     chat_link=self.chat_link,
@@ -92,10 +90,16 @@ class InvitingThread(QThread):
                     delay=self.delay
                 )
             )
+            if self._stop_requested:
+                self._future.cancel()
+            stats = self._future.result()
             
             # Отправляем результаты
             self.finished_signal.emit(stats)
             
+        except CancelledError:
+            # Остановлен пользователем
+            pass
         except Exception as e:
             self.error_signal.emit(str(e))
         finally:
@@ -103,7 +107,6 @@ class InvitingThread(QThread):
             if self.log_handler:
                 inviter_logger = logging.getLogger('src.core.inviter')
                 inviter_logger.removeHandler(self.log_handler)
-            loop.close()
 
 
 class InvitingWidget(QWidget):
@@ -120,8 +123,7 @@ class InvitingWidget(QWidget):
         super().__init__()
         self.account_manager = account_manager
         self.database = database
-        self.async_manager = AsyncManager(account_manager, database)
-        self.inviter = Inviter(self.async_manager, database)
+        self.inviter = None  # Будет инициализирован при первом использовании
         self.is_running = False  # Флаг для отслеживания состояния инвайтинга
         self.selected_accounts = []  # Список выбранных аккаунтов
         self.success_count = 0  # Счётчик успешно добавленных
@@ -312,21 +314,19 @@ class InvitingWidget(QWidget):
         try:
             # Получаем всех распарсенных пользователей из БД
             query = "SELECT DISTINCT username FROM parsed_users WHERE username IS NOT NULL AND username != ''"
-            rows = self.database.fetch_all(query)
             
-            if not rows:
-                self.log_message("⚠️ В базе данных нет распарсенных пользователей")
-                return
-            
-            # Формируем список username в формате @username
+            # Формируем список username в формате @username (строки читаются порциями)
             users_list = []
-            for row in rows:
+            for row in self.database.iter_rows(query):
                 username = row['username']
-                if username:
-                    # Убеждаемся, что username начинается с @
-                    if not username.startswith('@'):
-                        username = f"@{username}"
-                    users_list.append(username)
+                # Убеждаемся, что username начинается с @
+                if not username.startswith('@'):
+                    username = f"@{username}"
+                users_list.append(username)
+            
+            if not users_list:
+                self.log_message("⚠️ В базе данных нет распарсенных пользователей")
+                return
             
             # Добавляем в QTextEdit (добавляем к существующему содержимому)
             current_text = self.users_text.toPlainText()
@@ -470,6 +470,27 @@ class InvitingWidget(QWidget):
         self.error_label.setText(f"Ошибок: {self.error_count}")
         self.skipped_label.setText(f"Пропущено: {self.skipped_count}")
     
+    def _get_inviter(self):
+        """Получает или создаёт экземпляр Inviter на AsyncManager главного окна"""
+        if self.inviter is None:
+            # Находим главное окно для получения async_manager
+            main_window = None
+            for widget in QApplication.topLevelWidgets():
+                if hasattr(widget, 'async_manager'):
+                    main_window = widget
+                    break
+            
+            if main_window and hasattr(main_window, 'async_manager'):
+                # Inviter тянет за собой Telethon: импортируем при первом инвайтинге
+                from src.core.inviter import Inviter
+                self.inviter = Inviter(main_window.async_manager, self.database)
+                logger.info("Inviter создан для InvitingWidget")
+            else:
+                logger.error("Не удалось найти async_manager для создания Inviter")
+                return None
+        
+        return self.inviter
+    
     def start_inviting(self):
         """Запускает процесс инвайтинга через Inviter в отдельном потоке"""
         try:
@@ -497,6 +518,12 @@ class InvitingWidget(QWidget):
             # Ограничиваем список пользователей до максимума с аккаунта
             users_to_invite = users[:max_per_account]
             
+            # Получаем inviter
+            inviter = self._get_inviter()
+            if not inviter:
+                self.log_message("❌ Не удалось инициализировать Inviter")
+                return
+            
             # Устанавливаем флаг запуска
             self.is_running = True
             
@@ -525,7 +552,7 @@ class InvitingWidget(QWidget):
             
             # Создаём поток для инвайтинга
             self.inviting_thread = InvitingThread(
-                inviter=self.inviter,
+                inviter=inviter,
                 phone=self.selected_accounts[0],  # Используем первый выбранный аккаунт
                 chat_link=target_chat,
                 user_list=users_to_invite,
@@ -555,8 +582,8 @@ class InvitingWidget(QWidget):
         """Останавливает процесс инвайтинга"""
         try:
             if self.inviting_thread and self.inviting_thread.isRunning():
+                # Операция отменяется в фоновом loop, поток завершается сам
                 self.inviting_thread.stop()
-                self.inviting_thread.terminate()
                 self.inviting_thread.wait()
                 self.log_message("⏹ Инвайтинг остановлен пользователем")
                 logger.info("Инвайтинг остановлен пользователем")
@@ -3,7 +3,6 @@
 """
 
 import logging
-import asyncio
 import csv
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit,
@@ -22,6 +21,9 @@ from src.core.async_manager import AsyncManager
 
 logger = logging.getLogger(__name__)
 
+# Флаги ячеек таблицы результатов: выделяемые, но не редактируемые
+READONLY_FLAGS = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+
 
 class ParsingThread(QThread):
     """Поток для выполнения парсинга в фоне"""
@@ -53,27 +55,22 @@ class ParsingThread(QThread):
     def run(self):
         """Запуск парсинга в потоке"""
         try:
-            # Создаём новый event loop для потока
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Запускаем парсинг
-            results = loop.run_until_complete(
+            # Парсинг выполняется в общем фоновом loop AsyncManager: клиенты
+            # Telegram остаются подключёнными между запусками
+            results = self.parser.async_manager.run_in_worker(
                 self.parser.parse_chat_participants(
                     self.phone,
                     self.chat_link,
                     self.limit,
                     self.filters
                 )
-            )
+            ).result()
             
             # Отправляем результаты
             self.finished_signal.emit(results)
             
         except Exception as e:
             self.error_signal.emit(str(e))
-        finally:
-            loop.close()
 
 
 class ParsingWidget(QWidget):
@@ -564,52 +561,56 @@ class ParsingWidget(QWidget):
             results: Список словарей с данными участников
         """
         try:
-            # Очищаем таблицу
-            self.results_table.setRowCount(0)
-            
-            # Заполняем таблицу
-            for user in results:
-                row = self.results_table.rowCount()
-                self.results_table.insertRow(row)
-                
-                # Username
-                username = user.get('username', 'N/A')
-                if username and username != 'N/A':
-                    username = f"@{username}"
-                username_item = QTableWidgetItem(username)
-                username_item.setFlags(username_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.results_table.setItem(row, 0, username_item)
-                
-                # ID
-                id_item = QTableWidgetItem(str(user.get('id', 'N/A')))
-                id_item.setFlags(id_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.results_table.setItem(row, 1, id_item)
-                
-                # Имя
-                first_name = user.get('first_name', '')
-                last_name = user.get('last_name', '')
-                full_name = f"{first_name} {last_name}".strip() or 'N/A'
-                name_item = QTableWidgetItem(full_name)
-                name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.results_table.setItem(row, 2, name_item)
-                
-                # Телефон
-                phone = user.get('phone', 'N/A')
-                phone_item = QTableWidgetItem(str(phone) if phone else 'N/A')
-                phone_item.setFlags(phone_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.results_table.setItem(row, 3, phone_item)
-                
-                # Бот?
-                is_bot = user.get('is_bot', False)
-                bot_item = QTableWidgetItem("Да" if is_bot else "Нет")
-                bot_item.setFlags(bot_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.results_table.setItem(row, 4, bot_item)
+            # Отключаем перерисовку и выделяем все строки сразу
+            self.results_table.setUpdatesEnabled(False)
+            try:
+                # Очищаем таблицу
+                self.results_table.setRowCount(0)
+                self.results_table.setRowCount(len(results))
                 
-                # Premium?
-                is_premium = user.get('is_premium', False)
-                premium_item = QTableWidgetItem("Да" if is_premium else "Нет")
-                premium_item.setFlags(premium_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.results_table.setItem(row, 5, premium_item)
+                # Заполняем таблицу
+                for row, user in enumerate(results):
+                    
+                    # Username
+                    username = user.get('username', 'N/A')
+                    if username and username != 'N/A':
+                        username = f"@{username}"
+                    username_item = QTableWidgetItem(username)
+                    username_item.setFlags(READONLY_FLAGS)
+                    self.results_table.setItem(row, 0, username_item)
+                    
+                    # ID
+                    id_item = QTableWidgetItem(str(user.get('id', 'N/A')))
+                    id_item.setFlags(READONLY_FLAGS)
+                    self.results_table.setItem(row, 1, id_item)
+                    
+                    # Имя
+                    first_name = user.get('first_name', '')
+                    last_name = user.get('last_name', '')
+                    full_name = f"{first_name} {last_name}".strip() or 'N/A'
+                    name_item = QTableWidgetItem(full_name)
+                    name_item.setFlags(READONLY_FLAGS)
+                    self.results_table.setItem(row, 2, name_item)
+                    
+                    # Телефон
+                    phone = user.get('phone', 'N/A')
+                    phone_item = QTableWidgetItem(str(phone) if phone else 'N/A')
+                    phone_item.setFlags(READONLY_FLAGS)
+                    self.results_table.setItem(row, 3, phone_item)
+                    
+                    # Бот?
+                    is_bot = user.get('is_bot', False)
+                    bot_item = QTableWidgetItem("Да" if is_bot else "Нет")
+                    bot_item.setFlags(READONLY_FLAGS)
+                    self.results_table.setItem(row, 4, bot_item)
+                    
+                    # Premium?
+                    is_premium = user.get('is_premium', False)
+                    premium_item = QTableWidgetItem("Да" if is_premium else "Нет")
+                    premium_item.setFlags(READONLY_FLAGS)
+                    self.results_table.setItem(row, 5, premium_item)
+            finally:
+                self.results_table.setUpdatesEnabled(True)
             
             # Обновляем метку с количеством
             self.results_count_label.setText(f"Найдено: {len(results)} участников")
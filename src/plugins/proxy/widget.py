@@ -211,35 +211,39 @@ class ProxyWidget(QWidget):
             # Создаём словарь для быстрого поиска аккаунтов
             accounts_dict = {acc['id']: acc for acc in accounts}
             
-            # Очищаем таблицу
-            self.proxies_table.setRowCount(0)
-            
-            # Заполняем таблицу
-            for proxy in proxies:
-                row = self.proxies_table.rowCount()
-                self.proxies_table.insertRow(row)
-                
-                # Аккаунт
-                account_id = proxy['account_id']
-                account_info = accounts_dict.get(account_id, {})
-                account_text = account_info.get('phone', f"ID: {account_id}")
-                self.proxies_table.setItem(row, 0, QTableWidgetItem(account_text))
-                
-                # Тип прокси
-                proxy_type = proxy['proxy_type'].upper()
-                self.proxies_table.setItem(row, 1, QTableWidgetItem(proxy_type))
+            # Отключаем перерисовку и выделяем все строки сразу
+            self.proxies_table.setUpdatesEnabled(False)
+            try:
+                # Очищаем таблицу
+                self.proxies_table.setRowCount(0)
+                self.proxies_table.setRowCount(len(proxies))
                 
-                # Хост:Порт
-                host_port = f"{proxy['host']}:{proxy['port']}"
-                self.proxies_table.setItem(row, 2, QTableWidgetItem(host_port))
-                
-                # Ротация
-                rotation_text = "Да" if proxy['rotation_enabled'] else "Нет"
-                self.proxies_table.setItem(row, 3, QTableWidgetItem(rotation_text))
-                
-                # Статус (пока placeholder)
-                status_text = "Активен"
-                self.proxies_table.setItem(row, 4, QTableWidgetItem(status_text))
+                # Заполняем таблицу
+                for row, proxy in enumerate(proxies):
+                    
+                    # Аккаунт
+                    account_id = proxy['account_id']
+                    account_info = accounts_dict.get(account_id, {})
+                    account_text = account_info.get('phone', f"ID: {account_id}")
+                    self.proxies_table.setItem(row, 0, QTableWidgetItem(account_text))
+                    
+                    # Тип прокси
+                    proxy_type = proxy['proxy_type'].upper()
+                    self.proxies_table.setItem(row, 1, QTableWidgetItem(proxy_type))
+                    
+                    # Хост:Порт
+                    host_port = f"{proxy['host']}:{proxy['port']}"
+                    self.proxies_table.setItem(row, 2, QTableWidgetItem(host_port))
+                    
+                    # Ротация
+                    rotation_text = "Да" if proxy['rotation_enabled'] else "Нет"
+                    self.proxies_table.setItem(row, 3, QTableWidgetItem(rotation_text))
+                    
+                    # Статус (пока placeholder)
+                    status_text = "Активен"
+                    self.proxies_table.setItem(row, 4, QTableWidgetItem(status_text))
+            finally:
+                self.proxies_table.setUpdatesEnabled(True)
             
             self.log_message(f"✅ Загружено прокси: {len(proxies)}")
             logger.info(f"Загружено прокси: {len(proxies)}")
@@ -343,9 +347,7 @@ class ProxyWidget(QWidget):
             rotation_interval = self.rotation_interval_spinbox.value() if rotation_enabled else 0
             
             # Проверяем, существует ли уже прокси для этого аккаунта
-            existing_proxy = self.proxy_manager.get_proxy(account_id)
-            
-            if existing_proxy:
+            if self.proxy_manager.proxy_exists(account_id):
                 # Обновляем существующий прокси
                 self.proxy_manager.update_proxy(
                     account_id,
@@ -106,6 +106,59 @@ def main():
         except Exception as e:
             print(f"❌ Неожиданная ошибка: {e}\n")
         
+        # Тест 6: Пакетное добавление аккаунтов
+        print("=" * 50)
+        print("ТЕСТ 6: Пакетное добавление аккаунтов (дубликаты пропускаются)")
+        print("=" * 50)
+        try:
+            # Убираем номера прошлого запуска, чтобы результат не зависел от состояния test_accounts.db
+            for phone in ("+79002000001", "+79002000002"):
+                account_manager.delete_account(phone)
+            
+            inserted = account_manager.add_accounts_bulk([
+                ("+79002000001", 1001, "0123456789abcdef0123456789abcdef", None),
+                ("+79002000002", 1002, "fedcba9876543210fedcba9876543210", "bulk_session"),
+                ("+79002000001", 1001, "0123456789abcdef0123456789abcdef", None),  # дубликат в пакете
+                ("+79001234567", 12345, "test_hash_123", "test_session"),  # уже есть в БД
+            ])
+            phones = [phone for _, phone in inserted]
+            if phones == ["+79002000001", "+79002000002"]:
+                print(f"✅ Добавлено аккаунтов: {len(inserted)}, дубликаты пропущены: {inserted}\n")
+            else:
+                print(f"❌ Неожиданный результат пакетного добавления: {inserted}\n")
+            
+            # Повторный пакет полностью состоит из дубликатов
+            if account_manager.add_accounts_bulk([("+79002000002", 1002, "fedcba9876543210fedcba9876543210", None)]) == []:
+                print("✅ Повторный пакет не добавил ни одного аккаунта\n")
+            else:
+                print("❌ Повторный пакет добавил дубликат\n")
+        except Exception as e:
+            print(f"❌ Ошибка пакетного добавления: {e}\n")
+        
+        # Тест 7: Метаданные аккаунта не содержат session_string
+        print("=" * 50)
+        print("ТЕСТ 7: Метаданные аккаунта без session_string (из БД и из кэша)")
+        print("=" * 50)
+        try:
+            account_manager.invalidate_cache("+79002000002")
+            from_db = account_manager.get_account_meta_by_phone("+79002000002")
+            
+            # Полная запись попадает в кэш; метаданные из кэша должны совпадать с метаданными из БД
+            account_manager.get_account_by_phone("+79002000002")
+            from_cache = account_manager.get_account_meta_by_phone("+79002000002")
+            
+            if from_db and 'session_string' not in from_db and from_cache == from_db:
+                print(f"✅ Метаданные получены: {sorted(from_db)}\n")
+            else:
+                print(f"❌ Неверные метаданные: из БД {from_db}, из кэша {from_cache}\n")
+            
+            if account_manager.get_account_meta_by_phone("+79999999999") is None:
+                print("✅ Метаданные несуществующего аккаунта: None\n")
+            else:
+                print("❌ Найдены метаданные несуществующего аккаунта\n")
+        except Exception as e:
+            print(f"❌ Ошибка получения метаданных: {e}\n")
+        
         print("=" * 50)
         print("ТЕСТИРОВАНИЕ ЗАВЕРШЕНО")
         print("=" * 50)
@@ -0,0 +1,137 @@
+"""
+Тестовый файл для проверки ограничителя запросов (antiflood) TeleMatrix Pro
+"""
+
+import asyncio
+import gc
+import logging
+import time
+from types import SimpleNamespace
+
+from telethon.errors import FloodWaitError
+
+from src.core import antiflood
+from src.core.antiflood import AsyncLimiter, async_antiflood, get_limiter
+
+# Настройка логирования
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+class FakeClient:
+    """Заменитель TelegramClient: считает вызовы и падает FloodWait заданное число раз"""
+    
+    def __init__(self, flood_waits: int = 0):
+        self.session = SimpleNamespace(dc_id=2)
+        self.flood_waits = flood_waits
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+    
+    async def request(self, value):
+        self.calls += 1
+        if self.calls <= self.flood_waits:
+            raise FloodWaitError(request=None, capture=0)
+        return value
+    
+    async def slow_request(self):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+
+
+async def run_tests():
+    """Тестирование antiflood"""
+    # Тест 1: Token bucket пропускает не больше max_rate запросов сразу
+    print("=" * 50)
+    print("ТЕСТ 1: Ограничитель AsyncLimiter (5 запросов за 0.5 сек)")
+    print("=" * 50)
+    limiter = AsyncLimiter(5, 0.5)
+    start = time.perf_counter()
+    for _ in range(10):
+        await limiter.acquire()
+    elapsed = time.perf_counter() - start
+    # 5 токенов есть сразу, ещё 5 пополняются за 0.5 сек
+    if 0.4 <= elapsed < 1.0:
+        print(f"✅ 10 запросов заняли {elapsed:.2f} сек\n")
+    else:
+        print(f"❌ Неожиданное время 10 запросов: {elapsed:.2f} сек\n")
+    
+    # Тест 2: Реестр ограничителей по клиентам
+    print("=" * 50)
+    print("ТЕСТ 2: Реестр ограничителей (один на клиента, без утечки)")
+    print("=" * 50)
+    client = FakeClient()
+    other = FakeClient()
+    client_limiter = get_limiter(client)
+    other_limiter = get_limiter(other)
+    if get_limiter(client) is client_limiter and client_limiter is not other_limiter:
+        print("✅ У клиента один ограничитель на все запросы, у другого клиента свой\n")
+    else:
+        print("❌ Ограничители клиентов перепутаны\n")
+    
+    registered = len(antiflood._limiters)
+    del other, other_limiter
+    gc.collect()
+    if len(antiflood._limiters) == registered - 1:
+        print("✅ Ограничитель удалён вместе с клиентом\n")
+    else:
+        print("❌ Ограничитель удалённого клиента остался в реестре\n")
+    
+    # В тестах не ждём реальных FloodWait: запас над e.seconds убираем
+    antiflood.FLOOD_WAIT_MARGIN = 0.0
+    
+    # Тест 3: Повтор после FloodWait
+    print("=" * 50)
+    print("ТЕСТ 3: Повтор запроса после FloodWait")
+    print("=" * 50)
+    client = FakeClient(flood_waits=2)
+    try:
+        result = await async_antiflood(client.request, "ok", base=0.01)
+        if result == "ok" and client.calls == 3:
+            print(f"✅ Запрос выполнен с {client.calls}-й попытки\n")
+        else:
+            print(f"❌ Неожиданный результат: {result}, попыток: {client.calls}\n")
+    except Exception as e:
+        print(f"❌ Ошибка запроса: {e}\n")
+    
+    # Тест 4: FloodWait после всех повторов пробрасывается
+    print("=" * 50)
+    print("ТЕСТ 4: FloodWait после исчерпания повторов")
+    print("=" * 50)
+    client = FakeClient(flood_waits=10)
+    try:
+        await async_antiflood(client.request, "ok", retries=2, base=0.01)
+        print("❌ FloodWait не был проброшен\n")
+    except FloodWaitError:
+        print(f"✅ FloodWait проброшен после {client.calls} попыток\n")
+    
+    # Тест 5: Семафор дата-центра
+    print("=" * 50)
+    print("ТЕСТ 5: Одновременные запросы к дата-центру")
+    print("=" * 50)
+    client = FakeClient()
+    await asyncio.gather(*(async_antiflood(client.slow_request) for _ in range(10)))
+    if client.peak <= antiflood.DC_CONCURRENCY:
+        print(f"✅ Одновременно выполнялось не больше {client.peak} запросов\n")
+    else:
+        print(f"❌ Одновременно выполнялось {client.peak} запросов (лимит {antiflood.DC_CONCURRENCY})\n")
+    
+    print("=" * 50)
+    print("ТЕСТИРОВАНИЕ ЗАВЕРШЕНО")
+    print("=" * 50)
+
+
+def main():
+    """Запуск тестов antiflood"""
+    try:
+        asyncio.run(run_tests())
+    except Exception as e:
+        print(f"❌ Критическая ошибка: {e}")
+
+
+if __name__ == "__main__":
+    main()